@@ -1,25 +1,34 @@
 import asyncio
+import concurrent.futures
+import contextlib
+import hashlib
 import logging
+import multiprocessing
 import os
+import secrets
+import time
 import uuid
-from collections import defaultdict
-from datetime import datetime
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
 from pathlib import Path
 
 import uvicorn
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
 
-from backend.graph import Graph
+from backend.graph import Graph, close_airtable_batcher
 from backend.services.mongodb import MongoDBService
-from backend.services.pdf_service import PDFService
+from backend.services.pdf_service import PDFService, generate_pdf_stream
 from backend.services.websocket_manager import WebSocketManager
+from backend.utils.blocking import run_blocking
+from backend.utils.http_clients import close_http_clients
 
 # ⬇️ This import remains as it's used by the GRAPH, not directly here ⬇️
-from backend.airtable_uploader import update_airtable_record
+from backend.airtable_uploader import update_airtable_records_bulk
 from backend.debug_airtable import run_airtable_debug_test
 # ⬆️ END AIRTABLE IMPORTS ⬆️
 
@@ -34,7 +43,50 @@ logger.setLevel(logging.INFO)
 console_handler = logging.StreamHandler()
 logger.addHandler(console_handler)
 
-app = FastAPI(title="Tavily Company Research API")
+# Markdown-to-PDF rendering is CPU-bound, so it runs in a small process pool
+# rather than the shared thread pool. Each worker is a full interpreter, so
+# keep PDF_WORKERS low.
+pdf_executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+def _new_pdf_executor() -> concurrent.futures.ProcessPoolExecutor:
+    """Starts the PDF pool with spawned workers; forking a threaded uvloop server is unsafe."""
+    pdf_workers = int(os.getenv("PDF_WORKERS", "2"))
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=pdf_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    logger.info(f"PDF process pool started with {pdf_workers} workers.")
+    return executor
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Creates the shared executors, Airtable status worker and HTTP clients, and tears them down on shutdown.
+
+    The default executor (used by run_blocking) is per process: with N uvicorn
+    workers the effective pool is N x THREAD_POOL_SIZE threads.
+    """
+    global airtable_update_queue, _airtable_worker_task, pdf_executor
+    pool_size = int(os.getenv("THREAD_POOL_SIZE", "64"))
+    thread_executor = concurrent.futures.ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="fastapi-to-thread")
+    asyncio.get_running_loop().set_default_executor(thread_executor)
+    logger.info(f"Default thread pool executor set to {pool_size} workers.")
+
+    airtable_update_queue = asyncio.Queue()
+    _airtable_worker_task = asyncio.create_task(_airtable_batch_worker())
+
+    pdf_executor = _new_pdf_executor()
+
+    try:
+        yield
+    finally:
+        _airtable_worker_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _airtable_worker_task
+        await close_airtable_batcher()
+        await close_http_clients()
+        pdf_executor.shutdown(wait=False, cancel_futures=True)
+        thread_executor.shutdown(wait=False)
+
+app = FastAPI(title="Tavily Company Research API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -47,15 +99,21 @@ app.add_middleware(
 manager = WebSocketManager()
 pdf_service = PDFService({"pdf_output_dir": "pdfs"})
 
-job_status = defaultdict(lambda: {
-    "status": "pending",
-    "result": None,
-    "error": None,
-    "debug_info": [],
-    "company": None,
-    "report": None,
-    "last_update": datetime.now().isoformat()
-})
+# Cached second-granularity timestamp for job_status "last_update" fields
+_last_ts_s = 0
+_last_ts_str = ""
+
+def now_iso() -> str:
+    """Returns the current UTC time as an ISO string, re-formatted at most once per second."""
+    global _last_ts_s, _last_ts_str
+    s = int(time.time())
+    if s != _last_ts_s:
+        _last_ts_s = s
+        _last_ts_str = datetime.fromtimestamp(s, tz=timezone.utc).isoformat()
+    return _last_ts_str
+
+# In-memory job status, bounded so finished jobs are evicted after 24h
+job_status = TTLCache(maxsize=10_000, ttl=24 * 3600)
 
 mongodb = None
 if mongo_uri := os.getenv("MONGODB_URI"):
@@ -66,6 +124,8 @@ if mongo_uri := os.getenv("MONGODB_URI"):
         logger.warning(f"Failed to initialize MongoDB: {e}. Continuing without persistence.")
 
 class ResearchRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", str_strip_whitespace=True)
+
     company: str
     company_url: str | None = None
     industry: str | None = None
@@ -79,6 +139,8 @@ class AirtableWebhookInput(ResearchRequest):
 # --- END v2 MODIFICATION ---
 
 class PDFGenerationRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     report_content: str
     company_name: str | None = None
 
@@ -87,31 +149,119 @@ class PDFGenerationRequest(BaseModel):
 # ----------------------------------------------------
 # Define the maximum number of research jobs allowed to run concurrently.
 MAX_CONCURRENT_JOBS = 5 
-job_semaphore = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+
+# Admission control: an explicit counter guarded by a Condition so the limit
+# can be resized at runtime (see /admin/concurrency) without touching
+# asyncio.Semaphore internals.
+_admission_cv = asyncio.Condition()
+_active_jobs = 0
+_max_jobs = MAX_CONCURRENT_JOBS
+
+# /admin/concurrency is disabled unless ADMIN_TOKEN is set, and can never raise
+# the limit above MAX_CONCURRENT_JOBS_CAP (each job spends LLM/Tavily/Airtable quota).
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+MAX_CONCURRENT_JOBS_CAP = int(os.getenv("MAX_CONCURRENT_JOBS_CAP", "20"))
+
+# Set by the WebSocket handler once a client is connected for a job, so
+# process_research only waits for the handshake when it hasn't happened yet.
+# Only UI (/research) jobs are registered; webhook jobs have no client to wait for.
+_ws_ready: dict[str, asyncio.Event] = {}
+
+class ConcurrencyUpdate(BaseModel):
+    max_concurrent_jobs: int
+
+# ----------------------------------------------------
+# 🟢 DUPLICATE JOB SUPPRESSION
+# ----------------------------------------------------
+# Identical requests (e.g. repeated Airtable automation triggers) reuse the
+# job that is already running. UI requests also reuse one that completed
+# within the last hour; a webhook re-trigger after completion is deliberate
+# and starts a fresh run so the record's Research Status is updated again.
+_inflight_jobs: dict[str, str] = {}  # fingerprint -> job_id
+_completed_jobs = TTLCache(maxsize=1_000, ttl=3600)  # fingerprint -> job_id
+
+def _job_fingerprint(data: ResearchRequest, airtable_record_id: str | None = None) -> str:
+    """Hashes the fields that determine a research run's output."""
+    key = f"{data.company}|{data.company_url}|{data.industry}"
+    if airtable_record_id:
+        # Each Airtable record needs its own upload, so only dedupe per record
+        key = f"{key}|{airtable_record_id}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+def _existing_job(fingerprint: str) -> dict | None:
+    """Returns the response for a matching running or recently completed job."""
+    if job_id := _inflight_jobs.get(fingerprint):
+        status, message = "already_running", "Research already in progress. Connect to WebSocket for updates."
+    elif job_id := _completed_jobs.get(fingerprint):
+        status, message = "already_completed", "Research already completed. Connect to WebSocket for the result."
+    else:
+        return None
+    return {
+        "status": status,
+        "job_id": job_id,
+        "message": message,
+        "websocket_url": f"/research/ws/{job_id}"
+    }
+
+# ----------------------------------------------------
+# 🟢 AIRTABLE STATUS BATCHING
+# ----------------------------------------------------
+# Status updates are queued and flushed by a single consumer, up to 10
+# records (Airtable's batch limit) per API call.
+AIRTABLE_BATCH_SIZE = 10
+AIRTABLE_BATCH_WINDOW = 0.05  # seconds to wait for more updates after the first
+
+airtable_update_queue: asyncio.Queue | None = None
+_airtable_worker_task: asyncio.Task | None = None
+
+async def _airtable_batch_worker():
+    """Drains queued (record_id, fields) updates and flushes them in batches."""
+    loop = asyncio.get_running_loop()
+    while True:
+        record_id, fields = await airtable_update_queue.get()
+        batch = {record_id: dict(fields)}
+        deadline = loop.time() + AIRTABLE_BATCH_WINDOW
+        while len(batch) < AIRTABLE_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                record_id, fields = await asyncio.wait_for(airtable_update_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            # Coalesce repeated updates to the same record; later fields win
+            batch.setdefault(record_id, {}).update(fields)
+        try:
+            result = await run_blocking(update_airtable_records_bulk, batch)
+            logger.debug(f"Airtable batch flush of {len(batch)} records: {result.get('status')}")
+        except Exception as e:
+            logger.error(f"Airtable batch flush failed for records {list(batch.keys())}: {e}", exc_info=True)
 
 # ----------------------------------------------------
 # 🟢 SEMAPHORE WRAPPER FOR BACKGROUND TASK
 # ----------------------------------------------------
-# Helper to perform the synchronous Airtable update call in a separate thread
+# Helper to queue an Airtable status update for the batch worker
 async def _update_airtable_status_queued(record_id: str, status_text: str):
-    """Helper to call the synchronous update function in a separate thread."""
+    """Helper to enqueue a status update for the Airtable batch worker."""
     if not record_id:
         logger.warning("Airtable status update skipped: No record ID provided.")
         return
-    try:
-        await asyncio.to_thread(update_airtable_record, record_id, {'Research Status': status_text})
-        logger.debug(f"Airtable status update successful for record {record_id} to {status_text}")
-    except Exception as e:
-        logger.error(f"Airtable status update failed for record {record_id} to {status_text}: {e}", exc_info=True)
+    await airtable_update_queue.put((record_id, {'Research Status': status_text}))
+    logger.debug(f"Airtable status update queued for record {record_id} to {status_text}")
 
 
 # --- v2 MODIFIED: Added google_drive_folder_url parameter ---
-async def run_job_with_semaphore(job_id: str, data: ResearchRequest, airtable_record_id: str | None, google_drive_folder_url: str | None):
-    """Acquires semaphore, runs the core research logic, and releases semaphore."""
-    
-    # 1. Acquire the semaphore (blocks if limit reached)
-    await job_semaphore.acquire()
-    logger.info(f"SEMAPHORE ACQUIRED: Job {job_id} starting. {job_semaphore._value} slots remaining.")
+async def run_job_with_semaphore(job_id: str, data: ResearchRequest, airtable_record_id: str | None, google_drive_folder_url: str | None, fingerprint: str | None = None):
+    """Acquires an admission slot, runs the core research logic, and releases the slot."""
+    global _active_jobs
+    if airtable_record_id is None:
+        _ws_ready.setdefault(job_id, asyncio.Event())
+
+    # 1. Acquire an admission slot (blocks if limit reached)
+    async with _admission_cv:
+        await _admission_cv.wait_for(lambda: _active_jobs < _max_jobs)
+        _active_jobs += 1
+        logger.info(f"SEMAPHORE ACQUIRED: Job {job_id} starting. {_max_jobs - _active_jobs} slots remaining.")
 
     try:
         # 2. **CRITICAL:** Update status from 'Queued' to 'In Progress' (via Grounding node)
@@ -124,30 +274,62 @@ async def run_job_with_semaphore(job_id: str, data: ResearchRequest, airtable_re
     except Exception as e:
         logger.error(f"Job {job_id} failed during execution: {e}")
     finally:
-        # 4. Release the semaphore (executed even if process_research fails)
-        job_semaphore.release()
-        logger.info(f"SEMAPHORE RELEASED: Job {job_id} finished. {job_semaphore._value} slots available.")
+        # 4. Release the slot (executed even if process_research fails)
+        async with _admission_cv:
+            _active_jobs -= 1
+            _admission_cv.notify(1)
+            logger.info(f"SEMAPHORE RELEASED: Job {job_id} finished. {_max_jobs - _active_jobs} slots available.")
+        _ws_ready.pop(job_id, None)
+        if fingerprint:
+            _inflight_jobs.pop(fingerprint, None)
+            # Only UI runs are reused after completion (see _existing_job)
+            if airtable_record_id is None and (status := job_status.get(job_id)) and status["status"] == "completed":
+                _completed_jobs[fingerprint] = job_id
+
+
+@app.post("/admin/concurrency")
+async def set_concurrency(data: ConcurrencyUpdate, x_admin_token: str | None = Header(default=None)):
+    """Resizes the research job concurrency limit at runtime (requires the X-Admin-Token header)."""
+    global _max_jobs
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    if not 1 <= data.max_concurrent_jobs <= MAX_CONCURRENT_JOBS_CAP:
+        raise HTTPException(status_code=400, detail=f"max_concurrent_jobs must be between 1 and {MAX_CONCURRENT_JOBS_CAP}")
+    async with _admission_cv:
+        _max_jobs = data.max_concurrent_jobs
+        # Wake every waiter so queued jobs re-check against the new limit
+        _admission_cv.notify_all()
+    logger.info(f"Concurrency limit set to {_max_jobs} ({_active_jobs} jobs active).")
+    return {"max_concurrent_jobs": _max_jobs, "active_jobs": _active_jobs}
 
 
-@app.options("/research")
-async def preflight():
-    response = JSONResponse(content=None, status_code=200)
-    response.headers["Access-Control-Allow-Origin"] = "*"
-    response.headers["Access-Control-Allow-Methods"] = "POST, OPTIONS"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
-    return response
-
 # --- v2 MODIFIED: process_research signature ---
 async def process_research(job_id: str, data: ResearchRequest, airtable_record_id: str | None = None, google_drive_folder_url: str | None = None):
+    job_status[job_id] = {
+        "status": "pending",
+        "result": None,
+        "error": None,
+        "debug_info": [],
+        "company": data.company,
+        "report": None,
+        "last_update": now_iso()
+    }
     try:
         if mongodb:
             # Include airtable_record_id in MongoDB job details
-            job_details = data.dict()
+            job_details = data.model_dump(exclude_none=True)
             job_details['airtable_record_id'] = airtable_record_id
             job_details['google_drive_folder_url'] = google_drive_folder_url # Add GDrive URL to log
-            mongodb.create_job(job_id, job_details)
+            await run_blocking(mongodb.create_job, job_id, job_details)
             
-        await asyncio.sleep(1)  # Allow WebSocket connection
+        # Give a UI client a chance to connect its WebSocket before streaming updates
+        if ws_ready := _ws_ready.get(job_id):
+            try:
+                await asyncio.wait_for(ws_ready.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                pass
 
         await manager.send_status_update(job_id, status="processing", message="Starting research")
 
@@ -170,28 +352,40 @@ async def process_research(job_id: str, data: ResearchRequest, airtable_record_i
              thread_config["configurable"]["google_drive_folder_url"] = google_drive_folder_url
         # --- End v2 Modification ---
 
-        state = {}
+        # Only keep the fields we need from each node output so intermediate
+        # payloads (search results, briefings) can be freed between iterations.
+        report_content = None
+        editor_report = None
+        last_error = None
         async for s in graph.run(thread=thread_config): # Pass the config here
-            state.update(s)
+            if 'report' in s:
+                report_content = s['report']
+            if 'editor' in s:
+                editor_report = (s['editor'] or {}).get('report')
+            if 'error' in s:
+                last_error = s['error']
         
         # Look for the compiled report. 'editor' key is no longer used, but keeping check is safe.
-        report_content = state.get('report') or (state.get('editor') or {}).get('report')
+        report_content = report_content or editor_report
         
-        # Airtable upload is handled inside the graph.run() call
+        # Airtable upload is handled inside the graph.run() call (batched by AirtableBatcher)
 
         if report_content:
             logger.info(f"Found report in final state (length: {len(report_content)})")
 
             # Update job status and MongoDB
-            job_status[job_id].update({
+            job_status[job_id] = {
                 "status": "completed",
-                "report": report_content,
+                "result": None,
+                "error": None,
+                "debug_info": [],
                 "company": data.company,
-                "last_update": datetime.now().isoformat()
-            })
+                "report": report_content,
+                "last_update": now_iso()
+            }
             if mongodb:
-                mongodb.update_job(job_id=job_id, status="completed")
-                mongodb.store_report(job_id=job_id, report_data={"report": report_content})
+                await run_blocking(mongodb.update_job, job_id=job_id, status="completed")
+                await run_blocking(mongodb.store_report, job_id=job_id, report_data={"report": report_content})
             
             # Simplified final WebSocket message
             await manager.send_status_update(
@@ -204,12 +398,12 @@ async def process_research(job_id: str, data: ResearchRequest, airtable_record_i
                 }
             )
         else:
-            logger.error(f"Research completed without finding report. State keys: {list(state.keys())}")
+            logger.error("Research completed without finding report.")
             
             # Check if there was a specific error in the state
             error_message = "No report found"
-            if error := state.get('error'):
-                error_message = f"Error: {error}"
+            if last_error:
+                error_message = f"Error: {last_error}"
             
             await manager.send_status_update(
                 job_id=job_id,
@@ -227,7 +421,7 @@ async def process_research(job_id: str, data: ResearchRequest, airtable_record_i
             error=str(e)
         )
         if mongodb:
-            mongodb.update_job(job_id=job_id, status="failed", error=str(e))
+            await run_blocking(mongodb.update_job, job_id=job_id, status="failed", error=str(e))
 # --- END CORE RESEARCH LOGIC ---
 
 
@@ -235,20 +429,23 @@ async def process_research(job_id: str, data: ResearchRequest, airtable_record_i
 async def research(data: ResearchRequest):
     try:
         logger.info(f"Received research request for {data.company}")
+        fingerprint = _job_fingerprint(data)
+        if existing := _existing_job(fingerprint):
+            logger.info(f"Duplicate research request for {data.company}, reusing job {existing['job_id']}")
+            return existing
+
         job_id = str(uuid.uuid4())
+        _inflight_jobs[fingerprint] = job_id
         # --- v2 MODIFIED: Pass google_drive_folder_url=None for UI runs ---
-        asyncio.create_task(run_job_with_semaphore(job_id, data, airtable_record_id=None, google_drive_folder_url=None)) 
+        asyncio.create_task(run_job_with_semaphore(job_id, data, airtable_record_id=None, google_drive_folder_url=None, fingerprint=fingerprint)) 
 
-        response = JSONResponse(content={
+        # CORS headers (including preflight) are handled by CORSMiddleware
+        return {
             "status": "accepted",
             "job_id": job_id,
             "message": "Research started. Connect to WebSocket for updates.",
             "websocket_url": f"/research/ws/{job_id}"
-        })
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "POST, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
-        return response
+        }
 
     except Exception as e:
         logger.error(f"Error initiating research: {str(e)}", exc_info=True)
@@ -263,27 +460,28 @@ async def start_research_webhook(data: AirtableWebhookInput):
     """
     try:
         logger.info(f"Received webhook request for {data.company} (Airtable ID: {data.airtable_record_id})")
-        
+
+        fingerprint = _job_fingerprint(data, data.airtable_record_id)
+        if existing := _existing_job(fingerprint):
+            logger.info(f"Duplicate webhook request for {data.company}, reusing job {existing['job_id']}")
+            return existing
+
         job_id = str(uuid.uuid4())
         
-        research_data = ResearchRequest(
-            company=data.company,
-            company_url=data.company_url,
-            industry=data.industry,
-            hq_location=data.hq_location
-        )
-        
         # 1. CRITICAL: Immediately update Airtable status to "Queued" 
         if data.airtable_record_id:
-             asyncio.create_task(_update_airtable_status_queued(data.airtable_record_id, "Queued"))
+             await _update_airtable_status_queued(data.airtable_record_id, "Queued")
 
         # 2. Start the job using the SEMAPHORE WRAPPER (This is now the non-blocking part)
+        # Registered only now, so a failure above doesn't leave a phantom in-flight job
+        _inflight_jobs[fingerprint] = job_id
         # --- v2 MODIFIED: Pass data.google_drive_folder_url ---
         asyncio.create_task(run_job_with_semaphore(
             job_id, 
-            research_data, 
+            data, # AirtableWebhookInput is a ResearchRequest; no copy needed
             data.airtable_record_id, 
-            data.google_drive_folder_url # <-- PASS GDrive URL
+            data.google_drive_folder_url, # <-- PASS GDrive URL
+            fingerprint=fingerprint
         ))
 
         return {
@@ -317,24 +515,42 @@ async def ping():
 @app.get("/research/pdf/{filename}")
 async def get_pdf(filename: str):
     pdf_path = os.path.join("pdfs", filename)
-    if not os.path.exists(pdf_path):
+    if not await run_blocking(os.path.exists, pdf_path):
         raise HTTPException(status_code=404, detail="PDF not found")
+    # FileResponse stats, opens and reads the file off the event loop and sets
+    # Content-Length, ETag/Last-Modified and a properly quoted Content-Disposition
     return FileResponse(pdf_path, media_type='application/pdf', filename=filename)
 
 @app.websocket("/research/ws/{job_id}")
 async def websocket_endpoint(websocket: WebSocket, job_id: str):
+    # Reject unknown jobs before completing the handshake. Queued jobs are
+    # registered in _ws_ready before they appear in job_status.
+    if (
+        job_id not in job_status
+        and job_id not in _ws_ready
+        and (not mongodb or not await run_blocking(mongodb.get_job, job_id))
+    ):
+        await websocket.close(code=4404)
+        return
+
     try:
-        await websocket.accept()
+        # manager.connect accepts the connection
         await manager.connect(websocket, job_id)
-
-        if job_id in job_status:
-            status = job_status[job_id]
+        if ws_ready := _ws_ready.get(job_id):
+            ws_ready.set()
+
+        if status := job_status.get(job_id):
+            result = status["result"]
+            if status["status"] == "completed":
+                # Same payload as the live completion update, so reconnecting
+                # (or duplicate-request) clients receive the report
+                result = {"report": status["report"], "company": status["company"]}
             await manager.send_status_update(
                 job_id,
                 status=status["status"],
                 message="Connected to status stream",
                 error=status["error"],
-                result=status["result"]
+                result=result
             )
 
         while True:
@@ -352,7 +568,7 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
 async def get_research(job_id: str):
     if not mongodb:
         raise HTTPException(status_code=501, detail="Database persistence not configured")
-    job = mongodb.get_job(job_id)
+    job = await run_blocking(mongodb.get_job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Research job not found")
     return job
@@ -360,22 +576,37 @@ async def get_research(job_id: str):
 @app.get("/research/{job_id}/report")
 async def get_research_report(job_id: str):
     if not mongodb:
-        if job_id in job_status:
-            result = job_status[job_id]
+        if result := job_status.get(job_id):
             if report := result.get("report"):
                 return {"report": report}
         raise HTTPException(status_code=404, detail="Report not found")
     
-    report = mongodb.get_report(job_id)
+    report = await run_blocking(mongodb.get_report, job_id)
     if not report:
         raise HTTPException(status_code=404, detail="Research report not found")
     return report
 
+async def _render_pdf(report_content: str, company_name: str | None):
+    """Renders a PDF in the process pool, replacing the pool if a worker has died."""
+    global pdf_executor
+    executor = pdf_executor
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, generate_pdf_stream, report_content, company_name
+        )
+    except BrokenProcessPool:
+        logger.error("PDF process pool is broken; restarting it and rendering this PDF in a thread.")
+        # Concurrent requests may all see the same broken pool; replace it once
+        if pdf_executor is executor:
+            pdf_executor = _new_pdf_executor()
+            executor.shutdown(wait=False, cancel_futures=True)
+        return await run_blocking(generate_pdf_stream, report_content, company_name)
+
 @app.post("/generate-pdf")
 async def generate_pdf(data: PDFGenerationRequest):
     """Generate a PDF from markdown content and stream it to the client."""
     try:
-        success, result = pdf_service.generate_pdf_stream(data.report_content, data.company_name)
+        success, result = await _render_pdf(data.report_content, data.company_name)
         if success:
             pdf_buffer, filename = result
             return StreamingResponse(
@@ -391,4 +622,14 @@ async def generate_pdf(data: PDFGenerationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # An import string is required for workers > 1. Job status and admission
+    # control are in-memory, so each worker tracks only its own jobs.
+    uvicorn.run(
+        "application:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
\ No newline at end of file
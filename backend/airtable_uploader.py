@@ -1,12 +1,130 @@
 # backend/airtable_uploader.py
+import contextlib
+import functools
 import os
 import logging
-from airtable import Airtable
+import random
+import threading
+import time
+import requests
+from pyairtable import Api, Table, retry_strategy
+from requests.adapters import HTTPAdapter
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections held by the shared Airtable session
+_POOL_SIZE = 10
+
+# Airtable allows 5 requests/second per base. Calls run in worker threads
+# (run_blocking, i.e. the default executor), so the limiter uses threading primitives.
+_MAX_CONCURRENT_REQUESTS = 5
+_MIN_REQUEST_INTERVAL = 0.21  # seconds between request starts
+_MAX_ATTEMPTS = 3
+_BACKOFF_BASE = 1.0  # seconds; doubled on each 429
+
+# Transport-level retries for transient server errors. 429s are left to
+# _call_airtable so they are not retried twice. POST (batch_create) is never
+# retried: a 5xx after Airtable has written the records would duplicate them.
+_RETRY_STRATEGY = retry_strategy(
+    total=5,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "PATCH", "PUT", "DELETE"}),
+)
+
+class AirtableRateLimiter:
+    """Bounds concurrent Airtable requests and spaces out their start times."""
+    def __init__(self, max_concurrent: int = _MAX_CONCURRENT_REQUESTS, min_interval: float = _MIN_REQUEST_INTERVAL):
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._min_interval = min_interval
+        self._next_start = 0.0
+
+    @contextlib.contextmanager
+    def slot(self):
+        with self._semaphore:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._next_start - now
+                self._next_start = max(now, self._next_start) + self._min_interval
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+_rate_limiter = AirtableRateLimiter()
+
+class AirtableRateLimitError(RuntimeError):
+    """Raised when Airtable still answers 429 after every backoff attempt."""
+
+def _call_airtable(request_fn, *args, **kwargs):
+    """Runs one Airtable API call under the rate limiter, retrying 429s with exponential backoff."""
+    for attempt in range(_MAX_ATTEMPTS):
+        with _rate_limiter.slot():
+            try:
+                return request_fn(*args, **kwargs)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 429:
+                    raise
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise AirtableRateLimitError(f"Airtable rate limit persisted after {_MAX_ATTEMPTS} attempts") from e
+        delay = _BACKOFF_BASE * 2 ** attempt + random.uniform(0, 0.25)
+        logger.warning(f"Airtable rate limit hit; retrying in {delay:.2f}s (attempt {attempt + 1}/{_MAX_ATTEMPTS})")
+        time.sleep(delay)
+
+class AirtableConfigError(RuntimeError):
+    """Raised when the Airtable environment variables are not fully set."""
+
+@functools.lru_cache(maxsize=1)
+def _get_airtable_client() -> Tuple[Table, Dict[str, str]]:
+    """
+    Reads the Airtable env vars once and builds the shared Table client.
+    Its Api's requests.Session keeps a pooled keep-alive connection to Airtable.
+    Failures are not cached, so setting the env vars later still takes effect.
+    """
+    config = {
+        'api_key': os.getenv('AIRTABLE_API_KEY'),
+        'base_id': os.getenv('AIRTABLE_BASE_ID'),
+        'table_name': os.getenv('AIRTABLE_TABLE_NAME'),
+    }
+    if not all(config.values()):
+        raise AirtableConfigError("Airtable environment variables not set.")
+
+    api = Api(config['api_key'], retry_strategy=_RETRY_STRATEGY)
+    api.session.mount("https://", HTTPAdapter(
+        pool_connections=_POOL_SIZE,
+        pool_maxsize=_POOL_SIZE,
+        max_retries=_RETRY_STRATEGY
+    ))
+    return api.table(config['base_id'], config['table_name']), config
+
+def _reset_client_cache():
+    """Drops the cached client so the next call re-reads the environment (for tests)."""
+    _get_airtable_client.cache_clear()
+
+# --- v2 MODIFICATION: Add 'ReFED Alignment' to multi-select list ---
+_MULTI_SELECT_FIELDS = frozenset({'Industries', 'Country/Region', 'ReFED Alignment'})
+
+def _as_multi_select(value: Any) -> list:
+    """Coerces a multi-select value to a list (None/empty -> [])."""
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    try:
+        return list(value)
+    except TypeError:
+        return [str(value)]
+
+def _prepare_update_fields(fields_to_update: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerces multi-select fields to lists and drops None values, in one pass."""
+    # Keep empty lists/strings; None is only kept (as []) for multi-select fields
+    return {
+        k: _as_multi_select(v) if k in _MULTI_SELECT_FIELDS else v
+        for k, v in fields_to_update.items()
+        if v is not None or k in _MULTI_SELECT_FIELDS
+    }
+
 # --- Re-defined Helper (for internal use by other nodes to update status) ---
 def update_airtable_record(record_id: str, fields_to_update: Dict[str, Any]):
     """Updates specific fields of an existing Airtable record."""
@@ -14,167 +132,183 @@ def update_airtable_record(record_id: str, fields_to_update: Dict[str, Any]):
         logger.warning("Airtable update skipped: No record ID provided.")
         return {"status": "Skipped", "error": "No record ID"}
 
-    airtable_key = os.getenv('AIRTABLE_API_KEY')
-    base_id = os.getenv('AIRTABLE_BASE_ID')
-    table_name = os.getenv('AIRTABLE_TABLE_NAME')
-
-    if not all([airtable_key, base_id, table_name]):
+    try:
+        table, _ = _get_airtable_client()
+    except AirtableConfigError as e:
         logger.warning(f"Airtable update skipped: Environment variables not fully set.")
-        return {"status": "Skipped", "error": "Airtable environment variables not set."}
+        return {"status": "Skipped", "error": str(e)}
 
     try:
-        airtable = Airtable(
-            base_id=base_id,
-            table_name=table_name,
-            api_key=airtable_key
-        )
-
-        # --- v2 MODIFICATION: Add 'ReFED Alignment' to multi-select list ---
-        multi_select_fields = ['Industries', 'Country/Region', 'ReFED Alignment'] 
-        for field in multi_select_fields:
-            if field in fields_to_update:
-                value = fields_to_update[field]
-                if value is None:
-                    fields_to_update[field] = [] 
-                elif not isinstance(value, list):
-                    try:
-                        fields_to_update[field] = list(value) if value else []
-                    except TypeError:
-                        fields_to_update[field] = [str(value)] if value else []
-
-        # Remove fields with None values before updating, but keep empty lists/strings
-        fields_to_send_update = {k: v for k, v in fields_to_update.items() if v is not None}
-
-        logger.info(f"DEBUG: Fields being sent for UPDATE: {fields_to_send_update.keys()}")
-
-        updated_record = airtable.update(record_id, fields_to_send_update)
-        logger.info(f"Successfully updated Airtable record {record_id} with fields: {list(fields_to_send_update.keys())}")
+        fields_to_send_update = _prepare_update_fields(fields_to_update)
+
+        logger.debug("Fields being sent for UPDATE: %s", fields_to_send_update.keys())
+
+        _call_airtable(table.update, record_id, fields_to_send_update)
+        logger.info("Successfully updated Airtable record %s with fields: %s", record_id, fields_to_send_update.keys())
         return {"status": "Success", "airtable_record_id": record_id}
 
-    except Exception as e:
+    except requests.RequestException as e:
         logger.error(f"Airtable status update failed for record {record_id}: {str(e)}")
         return {"status": "Failure", "error": f"Airtable update failed: {str(e)}"}
 
+def update_airtable_records_bulk(updates: Dict[str, Dict[str, Any]]):
+    """
+    Updates several existing Airtable records in one batch call.
+    `updates` maps record_id -> fields; Airtable accepts at most 10 records per request.
+    """
+    if not updates:
+        return {"status": "Skipped", "error": "No records to update"}
+
+    try:
+        table, _ = _get_airtable_client()
+    except AirtableConfigError as e:
+        logger.warning(f"Airtable bulk update skipped: Environment variables not fully set.")
+        return {"status": "Skipped", "error": str(e)}
+
+    try:
+        records = [
+            {"id": record_id, "fields": _prepare_update_fields(fields)}
+            for record_id, fields in updates.items()
+        ]
+        for i in range(0, len(records), 10):
+            _call_airtable(table.batch_update, records[i:i + 10])
+        logger.info("Successfully bulk-updated %d Airtable records: %s", len(records), updates.keys())
+        return {"status": "Success", "airtable_record_ids": list(updates.keys())}
+
+    except requests.RequestException as e:
+        logger.error(f"Airtable bulk update failed for records {list(updates.keys())}: {str(e)}")
+        return {"status": "Failure", "error": f"Airtable bulk update failed: {str(e)}"}
+
 # --- NEW/MODIFIED Core Logic for UPSERT ---
-def _find_record_by_company(airtable: Airtable, company_name: str) -> Optional[str]:
-    """Searches Airtable for a record matching the Organization name."""
-    if not company_name:
-        return None
-        
+# --- v2: Airtable field mapping ---
+# (Airtable column name, internal report_data key from graph.py, default, max UTF-8 bytes)
+_FIELD_SPEC = (
+    ('Organization', 'company_name', 'N/A', None),
+    ('Website', 'company_url', '', None),
+
+    # --- v2 Tags ---
+    ('Industries', 'industries_tags', None, None),
+    ('Country/Region', 'region_tags', None, None),
+    ('Revenue Band (est.)', 'revenue_tags', None, None),
+    ('ReFED Alignment', 'refed_alignment_tags', None, None), # <-- NEW
+
+    # --- v2 Briefings & Report ---
+    ('Markdown Report', 'report_markdown', '', 10000),
+    ('Company Briefing', 'company_brief_briefing', '', 8000),                  # <-- RENAMED/NEW
+    ('News & Signals Briefing', 'news_signal_briefing', '', 8000),             # <-- RENAMED/NEW
+    ('FLW and Sustainability Briefing', 'flw_sustainability_briefing', '', 8000), # <-- KEPT
+    ('Potential Contacts Briefing', 'contact_briefing', '', 8000),             # <-- NEW
+    ('Engagements Briefing', 'engagement_briefing', '', 8000),                 # <-- NEW
+    # --- REMOVED: Financial Briefing, Industry Briefing, News Briefing (old) ---
+
+    # --- Meta Fields ---
+    ('Process Notes', 'process_notes', '', 10000),
+    ('References', 'references_formatted', '', 10000),
+)
+
+def _cap_bytes(s: str, limit: int) -> str:
+    """Truncates `s` to at most `limit` UTF-8 bytes without splitting a character."""
+    # Fast path: even at 4 bytes per character the string fits
+    if len(s) * 4 <= limit:
+        return s
+    b = s.encode('utf-8')
+    if len(b) <= limit:
+        return s
+    return b[:limit].decode('utf-8', 'ignore')
+
+def _cap(value: Any, cap: Optional[int]) -> Any:
+    """Caps a long text value at `cap` UTF-8 bytes (None -> ''); uncapped values pass through."""
+    if cap is None:
+        return value
+    if not value:
+        return ''
+    return _cap_bytes(value, cap)
+
+def _build_report_fields(report_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a final report_data dict to the Airtable fields payload."""
+    fields_payload = {'Research Status': 'Completed'}
+    for name, key, default, cap in _FIELD_SPEC:
+        value = _cap(report_data.get(key, default), cap)
+        # Drop None values (but keep empty lists/strings); multi-selects are always sent
+        if value is not None:
+            fields_payload[name] = value
+        elif name in _MULTI_SELECT_FIELDS:
+            fields_payload[name] = []
+    return fields_payload
+
+def upload_batch_to_airtable(reports: List[Dict[str, Any]]):
+    """
+    Upserts several final reports, at most 10 records per Airtable request.
+    Each item is a report_data dict (see upload_to_airtable). An optional
+    'airtable_record_id' key pins the record; otherwise Airtable merges on Organization.
+    Per-report results are returned in input order under 'records'.
+    """
+    if not reports:
+        return {"status": "Skipped", "error": "No reports to upload"}
+
     try:
-        # Airtable filtering requires a formula
-        # FIX: Escape single quotes
-        company_name_safe = company_name.replace("'", "\\'")
-        filter_formula = f"{{Organization}} = '{company_name_safe}'"
-        
-        # Limit to 1 record and only retrieve the ID
-        records = airtable.get_all(
-            view='Grid view', # Use a valid view name, 'Grid view' is common default
-            max_records=1,
-            fields=['Organization'], 
-            filter_by_formula=filter_formula
-        )
-        
-        if records and records[0].get('id'):
-            record_id = records[0]['id']
-            logger.info(f"Existing Airtable record found for '{company_name}': {record_id}")
-            return record_id
-        
-        logger.info(f"No existing Airtable record found for '{company_name}'.")
-        return None
-        
-    except Exception as e:
-        logger.error(f"Error searching for Airtable record by company '{company_name}': {e}")
-        return None
+        table, _ = _get_airtable_client()
+    except AirtableConfigError as e:
+        logger.warning("Airtable batch upload skipped: Environment variables not fully set.")
+        return {"status": "Skipped", "error": str(e)}
+
+    records = []
+    for report_data in reports:
+        record = {'fields': _build_report_fields(report_data)}
+        if report_data.get('airtable_record_id'):
+            record['id'] = report_data['airtable_record_id']
+        records.append(record)
+    logger.debug("Final payload keys being sent: %s", records[0]['fields'].keys())
+
+    # Records without a usable Organization have no merge key; always insert
+    # those rather than merging unnamed records together.
+    upsert_idx, create_idx = [], []
+    for i, record in enumerate(records):
+        if 'id' in record or record['fields'].get('Organization') not in (None, '', 'N/A'):
+            upsert_idx.append(i)
+        else:
+            create_idx.append(i)
+
+    results = [None] * len(records)
+    try:
+        for start in range(0, len(upsert_idx), 10):
+            chunk_idx = upsert_idx[start:start + 10]
+            result = _call_airtable(
+                table.batch_upsert,
+                [records[i] for i in chunk_idx], key_fields=['Organization']
+            )
+            created = set(result.get('createdRecords', []))
+            for i, record in zip(chunk_idx, result['records']):
+                operation = "INSERT" if record['id'] in created else "UPDATE"
+                results[i] = {"airtable_record_id": record['id'], "operation": operation}
+
+        for start in range(0, len(create_idx), 10):
+            chunk_idx = create_idx[start:start + 10]
+            created_records = _call_airtable(
+                table.batch_create,
+                [records[i]['fields'] for i in chunk_idx]
+            )
+            for i, record in zip(chunk_idx, created_records):
+                results[i] = {"airtable_record_id": record['id'], "operation": "INSERT"}
+
+    except requests.RequestException as e:
+        logger.error(f"Airtable batch upsert failed: {str(e)}")
+        return {"status": "Failure", "error": f"Airtable batch upsert failed: {str(e)}", "records": results}
+
+    logger.info(f"Airtable batch upsert successful for {len(records)} reports.")
+    return {"status": "Success", "records": results}
 
 def upload_to_airtable(report_data: Dict[str, Any], job_id: str, record_id: str = None):
     """
     (v2) Connects to Airtable and performs an UPSERT (Update or Insert).
     Maps all new v2 fields to their Airtable Column Names.
+    Without a record_id, Airtable matches on Organization server-side (performUpsert).
     """
-    airtable_key = os.getenv('AIRTABLE_API_KEY')
-    base_id = os.getenv('AIRTABLE_BASE_ID')
-    table_name = os.getenv('AIRTABLE_TABLE_NAME')
-    company_name = report_data.get('company_name', 'N/A')
-
-    if not all([airtable_key, base_id, table_name]):
-        logger.warning("Airtable upload/update skipped: Environment variables not fully set.")
-        return {"status": "Skipped", "error": "Airtable environment variables not set."}
+    logger.info(f"Performing Airtable UPSERT for job {job_id} (record: {record_id or 'match on Organization'})")
+    result = upload_batch_to_airtable([{**report_data, 'airtable_record_id': record_id}])
+    if result.get("status") != "Success":
+        return {k: v for k, v in result.items() if k != "records"}
 
-    try:
-        airtable = Airtable(base_id, table_name, airtable_key)
-    except Exception as e:
-        logger.error(f"Airtable initialization failed: {str(e)}")
-        return {"status": "Failure", "error": f"Airtable initialization failed: {str(e)}"}
-
-
-    # --- 1. v2: Map all fields to Airtable format ---
-    # NOTE: The keys on the *left* (e.g., 'Industries') are your *Airtable Column Names*.
-    # The keys on the *right* (e.g., 'industries_tags') are the *internal Python keys* from graph.py.
-    fields_to_send = {
-        'Organization': company_name, 
-        'Website': report_data.get('company_url', ''),
-        
-        # --- v2 Tags ---
-        'Industries': report_data.get('industries_tags', []),
-        'Country/Region': report_data.get('region_tags', []),
-        'Revenue Band (est.)': report_data.get('revenue_tags'),
-        'ReFED Alignment': report_data.get('refed_alignment_tags', []), # <-- NEW
-        
-        # --- v2 Briefings & Report ---
-        'Markdown Report': (report_data.get('report_markdown') or '')[:10000],
-        'Company Briefing': (report_data.get('company_brief_briefing') or '')[:8000],         # <-- RENAMED/NEW
-        'News & Signals Briefing': (report_data.get('news_signal_briefing') or '')[:8000],   # <-- RENAMED/NEW
-        'FLW and Sustainability Briefing': (report_data.get('flw_sustainability_briefing') or '')[:8000], # <-- KEPT
-        'Potential Contacts Briefing': (report_data.get('contact_briefing') or '')[:8000],     # <-- NEW
-        'Engagements Briefing': (report_data.get('engagement_briefing') or '')[:8000],          # <-- NEW
-        # --- REMOVED: Financial Briefing, Industry Briefing, News Briefing (old) ---
-
-        # --- Meta Fields ---
-        'Research Status': 'Completed', 
-        'Process Notes': (report_data.get('process_notes') or '')[:10000],
-        'References': (report_data.get('references_formatted') or '')[:10000]
-    }
-    
-    # Clean out None values before sending, but keep empty lists/strings
-    fields_payload = {}
-    for k, v in fields_to_send.items():
-        if v is not None:
-             fields_payload[k] = v
-        # v2: Ensure all multi-select lists are sent even if empty
-        elif k in ['Industries', 'Country/Region', 'ReFED Alignment']:
-            fields_payload[k] = []
-            
-    logger.info(f"DEBUG: Final payload keys being sent: {fields_payload.keys()}")
-
-
-    # --- 2. Determine Record ID (Search/Upsert Logic) ---
-    final_record_id = record_id
-    if not final_record_id and company_name != 'N/A':
-        # Search Airtable by Organization Name only if record_id wasn't provided (e.g., first run)
-        final_record_id = _find_record_by_company(airtable, company_name)
-
-
-    # --- 3. Execute UPSERT ---
-    if final_record_id:
-        # UPDATE: Record found, update all fields
-        logger.info(f"Performing UPDATE on Airtable record {final_record_id} for job {job_id}")
-        
-        update_result = update_airtable_record(final_record_id, fields_payload)
-        
-        if update_result.get("status") == "Success":
-            logger.info(f"Airtable UPDATE successful: {final_record_id}")
-            return {"status": "Success", "airtable_record_id": final_record_id, "operation": "UPDATE"}
-        else:
-            return update_result
-            
-    else:
-        # INSERT: No existing record found, insert a new one
-        logger.warning(f"No existing record found for job {job_id}, attempting INSERT as new record.")
-        try:
-            record = airtable.insert(fields_payload)
-            logger.info(f"Successfully inserted final data as new record: {record['id']}")
-            return {"status": "Success", "airtable_record_id": record['id'], "operation": "INSERT"}
-        except Exception as e:
-             logger.error(f"Airtable INSERT failed for job {job_id}: {str(e)}")
-             return {"status": "Failure", "error": f"Airtable final insert failed: {str(e)}"}
\ No newline at end of file
+    record_result = result["records"][0]
+    logger.info(f"Airtable {record_result['operation']} successful for job {job_id}: {record_result['airtable_record_id']}")
+    return {"status": "Success", **record_result}
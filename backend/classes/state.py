@@ -2,6 +2,8 @@
 from typing import TypedDict, NotRequired, Required, Dict, List, Any
 from backend.services.websocket_manager import WebSocketManager
 
+__all__ = ["InputState", "ResearchState"]
+
 # Define the input state
 class InputState(TypedDict, total=False):
     company: Required[str]
@@ -45,6 +47,11 @@ class ResearchState(InputState):
     references: List[str]
     reference_info: NotRequired[Dict[str, Dict[str, Any]]]
     reference_titles: NotRequired[Dict[str, str]]
+    references_formatted_cached: NotRequired[str] # Set by the raw compiler, reused by the uploader
+
+    # Notes for the Airtable "Process Notes" field, appended in place by nodes
+    process_notes: NotRequired[List[str]]
+    subqueries_log: NotRequired[List[str]] # One bullet list per researcher
     
     # Other state fields (Unchanged)
     briefings: Dict[str, Any] # Dictionary to hold all generated briefings
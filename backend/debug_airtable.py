@@ -1,10 +1,11 @@
 # backend/debug_airtable.py
 import asyncio
+import functools
 import logging
+from types import MappingProxyType
 from typing import cast
 
 from backend.classes.state import ResearchState
-from backend.nodes.tagger import Tagger
 from backend.graph import Graph # Use Graph for simplified airtable_upload_node access
 from backend.services.websocket_manager import WebSocketManager # Mock WebSocket Manager
 from langchain_core.messages import AIMessage
@@ -19,7 +20,8 @@ class DummyWebSocketManager:
         pass # Do nothing
 
 # --- MOCK STATE SETUP (Copy from test_airtable.py) ---
-mock_state_before_tagger: ResearchState = {
+# Read-only: each debug run builds its own state dict on top of this
+mock_state_before_tagger = MappingProxyType({
     'company': 'Sustainable Foods Inc.',
     'company_url': 'https://www.sustainablefoods.example',
     'hq_location': 'Austin, TX',
@@ -52,24 +54,30 @@ mock_state_before_tagger: ResearchState = {
          "https://www.sustainablefoods.example/sustainability": "Sustainability at Sustainable Foods Inc."
     },
     'briefings': {}
-}
+})
+
+@functools.lru_cache(maxsize=1)
+def _get_graph() -> Graph:
+    """Builds the Graph (and its nodes/clients) once for all debug runs."""
+    return Graph()
 
 # --- EXPORTED TEST FUNCTION ---
 async def run_airtable_debug_test(record_id: str | None = None):
     """Runs the Tagger and Airtable Upload logic directly."""
     logger.info("--- Starting Airtable Debug Test via API Endpoint ---")
     
-    state = cast(ResearchState, mock_state_before_tagger.copy())
-    if record_id:
-        state['airtable_record_id'] = record_id
-        state['job_id'] = f'test-job-debug-api-UPDATE-{record_id}'
-    else:
-        state['job_id'] = 'test-job-debug-api-INSERT'
+    job_id = f'test-job-debug-api-UPDATE-{record_id}' if record_id else 'test-job-debug-api-INSERT'
+    state = cast(ResearchState, {
+        **mock_state_before_tagger,
+        'job_id': job_id,
+        'airtable_record_id': record_id,
+        # Nodes append to messages, so don't share the module-level list
+        'messages': list(mock_state_before_tagger['messages']),
+    })
     
     # 1. Simulate Tagger Run (Classification)
     try:
-        tagger = Tagger()
-        state = await tagger.run(state)
+        state = await _get_graph().tagger.run(state)
         logger.info(f"Tagger finished. Tags: {state.get('airtable_industries')}")
     except Exception as e:
         logger.error(f"Tagger failed in debug run: {e}")
@@ -81,21 +89,13 @@ async def run_airtable_debug_test(record_id: str | None = None):
     # 2. Call the dedicated upload node function (must mock its parent class methods)
     try:
         # Since Graph.airtable_upload_node expects a complete state, we pass it.
-        # It handles all final data preparation and calls update_to_airtable.
-        # We need a dummy Graph instance to call the node function directly.
-        
-        # Instantiate a minimal Graph class to access the node function
-        class MockGraph:
-            async def airtable_upload_node(self, state):
-                 # Directly call the actual upload logic
-                 return await Graph.airtable_upload_node(Graph(), state)
+        # It handles all final data preparation and calls upload_to_airtable.
 
         # We must manually inject websocket_manager for graph.py's node
         state['websocket_manager'] = DummyWebSocketManager()
         
         # Call the upload node function
-        graph_instance = MockGraph()
-        final_state = await graph_instance.airtable_upload_node(state)
+        final_state = await _get_graph().airtable_upload_node(state)
         
         result_id = final_state.get('airtable_record_id')
         
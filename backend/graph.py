@@ -1,11 +1,18 @@
 # backend/graph.py
+import asyncio
+import contextlib
+import functools
+import io
 import logging
-from typing import Any, AsyncIterator, Dict
+from typing import Any, AsyncIterator, Dict, Final, List, NamedTuple
 from datetime import datetime
 
+import orjson
+
 from langchain_core.messages import AIMessage # Used in simple_report_compiler_node
 from langchain_core.messages import SystemMessage
 from langgraph.graph import StateGraph
+from langgraph.types import Send
 
 from .classes.state import InputState, ResearchState
 from .nodes import GroundingNode
@@ -24,47 +31,205 @@ from .nodes.researchers.contact_finder import ContactFinderNode     # NEW: Added
 from .nodes.researchers.engagement_finder import EngagementFinderNode # NEW: Added node
 # --- End v2 Node Imports ---
 
-from backend.airtable_uploader import upload_to_airtable
+from backend.airtable_uploader import upload_batch_to_airtable
+from backend.utils.blocking import run_blocking
 from backend.utils.references import format_references_section
 # --- NEW: Import for Google Drive Utility (we will create this file later) ---
 from backend.utils.gdrive_uploader import upload_context_to_gdrive
 
 logger = logging.getLogger(__name__)
 
+# (report_data key, state key, default) copied straight from state for the
+# Airtable upload. Missing multi-select tags default to None, which the
+# uploader sends as an empty list.
+_AIRTABLE_FIELDS = (
+    ("company_name", "company", None),
+    ("company_url", "company_url", None),
+
+    # --- v2 TAG MAPPINGS ---
+    ("industries_tags", "airtable_industries", None),
+    ("region_tags", "airtable_country_region", None),
+    ("refed_alignment_tags", "airtable_refed_alignment", None), # NEW
+
+    # --- v2 REPORT/BRIEFING MAPPINGS ---
+    ("report_markdown", "report", ""),
+    ("company_brief_briefing", "company_brief_briefing", ""),           # RENAMED
+    ("news_signal_briefing", "news_signal_briefing", ""),               # RENAMED
+    ("flw_sustainability_briefing", "flw_sustainability_briefing", ""), # KEPT
+    ("contact_briefing", "contact_briefing", ""),                       # NEW
+    ("engagement_briefing", "engagement_briefing", ""),                 # NEW
+    # REMOVED: financial_briefing, industry_briefing
+)
+
+# Large report_data fields left out of the upload log line
+_LOG_EXCLUDE_FIELDS = frozenset({
+    "report_markdown", "process_notes", "references_formatted",
+    "company_brief_briefing", "news_signal_briefing", "flw_sustainability_briefing",
+    "contact_briefing", "engagement_briefing"
+})
+
+class AirtableBatcher:
+    """
+    Collects final reports from concurrently finishing jobs and upserts them
+    together: up to MAX_BATCH records per request, waiting at most MAX_WAIT
+    seconds for a batch to fill. Each submitter awaits its own record's result.
+    """
+    MAX_BATCH = 10  # Airtable's per-request record limit
+    MAX_WAIT = 0.5  # seconds
+
+    def __init__(self):
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    async def submit(self, report_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Queues one report and returns its upload result once its batch is sent."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._drain())
+        future = loop.create_future()
+        self._queue.put_nowait((report_data, future))
+        return await future
+
+    async def _drain(self):
+        """Background task: gathers batches from the queue and uploads them."""
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        batch: List[Any] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.MAX_WAIT
+                while len(batch) < self.MAX_BATCH:
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        break
+                try:
+                    outcomes = await self._upload([report for report, _ in batch])
+                    if len(outcomes) != len(batch):
+                        raise RuntimeError(f"Expected {len(batch)} Airtable upload results, got {len(outcomes)}")
+                    for (_, future), outcome in zip(batch, outcomes):
+                        if future.done():
+                            continue
+                        if isinstance(outcome, Exception):
+                            future.set_exception(outcome)
+                        else:
+                            future.set_result(outcome)
+                except Exception as e:
+                    # Keep draining; a stranded future would hang its job (and admission slot)
+                    logger.error(f"Airtable batch of {len(batch)} reports could not be resolved: {e}", exc_info=True)
+                    self._fail(batch, e)
+                batch = []
+        finally:
+            # Cancelled by close() (or crashed): nothing else will resolve these
+            stopped = RuntimeError("Airtable batcher stopped before the report was uploaded")
+            self._fail(batch, stopped)
+            while not queue.empty():
+                self._fail([queue.get_nowait()], stopped)
+
+    @staticmethod
+    def _fail(batch: List[Any], exc: BaseException):
+        """Fails every still-pending future in a batch of (report, future) pairs."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _upload(self, reports: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Uploads reports in one batch and returns one result (or exception) per report.
+        A batch request fails as a whole on one bad record, so when a multi-report
+        batch fails, the reports without a result are retried one at a time.
+        """
+        try:
+            result = await run_blocking(upload_batch_to_airtable, reports)
+        except Exception as e:
+            logger.error(f"Airtable batch upload of {len(reports)} reports failed: {e}", exc_info=True)
+            result, records = e, []
+        else:
+            logger.info(f"Airtable batch upload of {len(reports)} reports: {result.get('status')}")
+            records = result.get("records") or []
+        failed = isinstance(result, Exception) or result.get("status") == "Failure"
+
+        outcomes: List[Any] = []
+        retry_idx = []
+        for i in range(len(reports)):
+            record_result = records[i] if i < len(records) else None
+            if record_result:
+                outcomes.append({"status": "Success", **record_result})
+            elif failed and len(reports) > 1:
+                outcomes.append(None)
+                retry_idx.append(i)
+            elif isinstance(result, Exception):
+                outcomes.append(result)
+            else:
+                outcomes.append({"status": result.get("status", "Failure"), "error": result.get("error")})
+
+        if retry_idx:
+            logger.warning(f"Retrying {len(retry_idx)} reports from the failed batch individually.")
+            retried = await asyncio.gather(*(self._upload([reports[i]]) for i in retry_idx))
+            for i, (outcome,) in zip(retry_idx, retried):
+                outcomes[i] = outcome
+        return outcomes
+
+    async def close(self):
+        """Cancels the drain task, failing any queued or in-flight reports; call on application shutdown."""
+        task, self._task = self._task, None
+        if task and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+# Shared by every Graph in the process so reports from different jobs share batches
+_airtable_batcher = AirtableBatcher()
+
+async def close_airtable_batcher() -> None:
+    """Stops the shared AirtableBatcher's background task."""
+    await _airtable_batcher.close()
+
+# --- v2: Updated to use the 5 new briefing keys ---
+_BRIEFING_KEYS_MAP: Final[Dict[str, str]] = {
+    'company_brief_briefing': 'Company Overview & Financial Health',
+    'news_signal_briefing': 'News & Signals',
+    'flw_sustainability_briefing': 'FLW & Sustainability',
+    'contact_briefing': 'Potential Contacts',
+    'engagement_briefing': 'Engagement & Affiliations'
+}
+# Preferred section order in the raw report
+_REPORT_ORDER: Final[tuple[str, ...]] = (
+    'company_brief_briefing',
+    'flw_sustainability_briefing',
+    'news_signal_briefing',
+    'engagement_briefing',
+    'contact_briefing'
+)
+# The 5 parallel research nodes; the first one is the progress marker
+_PARALLEL_RESEARCH_NODES: Final[tuple[str, ...]] = (
+    "company_brief_node",
+    "news_signal_node",
+    "flw_analyzer",
+    "contact_finder",
+    "engagement_finder"
+)
+# --- End v2 ---
+
 # --- UPDATED HELPER FUNCTION TO BYPASS EDITOR ---
 async def simple_report_compiler_node(state: ResearchState) -> ResearchState:
     """
     Compiles individual briefings into a raw, unedited markdown report (state['report'])
     as the editor node is now bypassed.
     """
-    # --- v2: Updated to use the 5 new briefing keys ---
-    briefing_keys_map = {
-        'company_brief_briefing': 'Company Overview & Financial Health',
-        'news_signal_briefing': 'News & Signals',
-        'flw_sustainability_briefing': 'FLW & Sustainability',
-        'contact_briefing': 'Potential Contacts',
-        'engagement_briefing': 'Engagement & Affiliations'
-    }
-    # Define preferred order
-    report_order = [
-        'company_brief_briefing', 
-        'flw_sustainability_briefing',
-        'news_signal_briefing', 
-        'engagement_briefing',
-        'contact_briefing'
-    ]
-    # --- End v2 Update ---
-
-    report_parts = []
+    # Write straight into one buffer; each section is separated by a blank line
+    buf = io.StringIO()
     
     company = state.get('company', 'Research Report')
-    report_parts.append(f"# {company} Research Report (Raw)\n")
+    buf.write(f"# {company} Research Report (Raw)\n")
 
-    for key in report_order:
+    for key in _REPORT_ORDER:
         content = state.get(key)
         if isinstance(content, str) and content.strip():
-            header = briefing_keys_map.get(key, key.replace('_', ' ').title())
-            report_parts.append(f"## {header}\n{content}\n")
+            header = _BRIEFING_KEYS_MAP.get(key, key.replace('_', ' ').title())
+            buf.write(f"\n## {header}\n{content}\n")
     
     # Append references section (logic remains the same)
     references_list = state.get("references", [])
@@ -73,29 +238,96 @@ async def simple_report_compiler_node(state: ResearchState) -> ResearchState:
         ref_titles = state.get("reference_titles", {})
         try:
             ref_text = format_references_section(references_list, ref_info, ref_titles)
-            report_parts.append(ref_text)
+            state['references_formatted_cached'] = ref_text
+            buf.write("\n")
+            buf.write(ref_text)
         except Exception as ref_fmt_exc:
             logger.error(f"Error formatting references during raw compilation: {ref_fmt_exc}")
-            report_parts.append("\n## References\n[Error formatting references]")
+            buf.write("\n\n## References\n[Error formatting references]")
             
-    final_report = "\n".join(report_parts)
+    final_report = buf.getvalue()
     state['report'] = final_report
     
     # Add status message to the stream for tracking
-    messages = state.get('messages', [])
-    messages.append(AIMessage(content=f"🚧 Editor Bypassed. Generated raw report from 5 briefings (Length: {len(final_report)} chars)."))
-    state['messages'] = messages
+    note = f"🚧 Editor Bypassed. Generated raw report from 5 briefings (Length: {len(final_report)} chars)."
+    state.setdefault('messages', []).append(AIMessage(content=note))
+    state.setdefault('process_notes', []).append(note)
     
     return state
 # --- END UPDATED HELPER FUNCTION ---
 
 
+class _SharedNodes(NamedTuple):
+    ground: GroundingNode
+    company_brief_node: CompanyBriefNode
+    news_signal_node: NewsSignalNode
+    flw_analyzer: FLWAnalyzer
+    contact_finder: ContactFinderNode
+    engagement_finder: EngagementFinderNode
+    collector: Collector
+    curator: Curator
+    enricher: Enricher
+    briefing: Briefing
+    tagger: Tagger
+
+
+@functools.lru_cache(maxsize=1)
+def _get_shared_nodes() -> _SharedNodes:
+    """
+    Builds the workflow nodes once per process. They hold only API clients and
+    config (all per-job data arrives through state), so every Graph shares them.
+    """
+    return _SharedNodes(
+        ground=GroundingNode(),
+        # --- v2: 5 new/refocused researcher nodes ---
+        company_brief_node=CompanyBriefNode(),
+        news_signal_node=NewsSignalNode(),
+        flw_analyzer=FLWAnalyzer(),
+        contact_finder=ContactFinderNode(),
+        engagement_finder=EngagementFinderNode(),
+        # --- End v2 ---
+        collector=Collector(),
+        curator=Curator(),
+        enricher=Enricher(),
+        briefing=Briefing(),
+        tagger=Tagger(),
+        # NOTE: editor is correctly removed
+    )
+
+
+def _build_progress_table() -> Dict[str, int]:
+    """Maps every node name to its progress percentage (computed once at import)."""
+    node_order = [
+        "grounding", 
+        "company_brief_node", # Use one of the parallel nodes as the marker
+        "collector", "curator", "enricher", "briefing",
+        "raw_compiler", "tagger", "airtable_uploader", "__end__"
+    ]
+    denom = len(node_order) - 1
+    table = {node: min(int(((i + 1) / denom) * 100), 100) for i, node in enumerate(node_order)}
+    # --- v2: All 5 parallel researchers share the marker's progress ---
+    for node in _PARALLEL_RESEARCH_NODES[1:]:
+        table[node] = table["company_brief_node"]
+    return table
+
+
 class Graph:
+    _PROGRESS_TABLE = _build_progress_table()
+    WS_UPDATE_INTERVAL = 0.1  # seconds
+    WS_QUEUE_SIZE = 32
+
     def __init__(self, company=None, url=None, hq_location=None, industry=None,
                  websocket_manager=None, job_id=None, google_drive_folder_url=None): # Added GDrive URL
         self.websocket_manager = websocket_manager
         self.job_id = job_id
 
+        # WebSocket state updates go through a bounded queue drained by a
+        # background sender (created per run), so slow clients never block the graph.
+        self._ws_queue: asyncio.Queue | None = None
+        self._ws_sender_task: asyncio.Task | None = None
+        # (node, progress, key count) of the last queued update, to skip repeats
+        self._last_ws_signature: tuple = ()
+
         self.input_state = InputState(
             company=company,
             company_url=url,
@@ -105,32 +337,65 @@ class Graph:
             job_id=job_id,
             airtable_record_id=None,
             google_drive_folder_url=google_drive_folder_url, # Pass GDrive URL
-            messages=[
-                SystemMessage(content="Expert researcher starting investigation")
-            ]
+        )
+        # Immutable template; each run gets its own fresh messages list
+        self._template_messages = (
+            SystemMessage(content="Expert researcher starting investigation"),
         )
 
         self._init_nodes()
         self._build_workflow()
 
     def _init_nodes(self):
-        """Initialize all workflow nodes (v2)"""
-        self.ground = GroundingNode()
+        """Attach the process-wide workflow nodes (v2)"""
+        nodes = _get_shared_nodes()
+        self.ground = nodes.ground
         
-        # --- v2: Initialize 5 new/refocused researcher nodes ---
-        self.company_brief_node = CompanyBriefNode()
-        self.news_signal_node = NewsSignalNode()
-        self.flw_analyzer = FLWAnalyzer()
-        self.contact_finder = ContactFinderNode()
-        self.engagement_finder = EngagementFinderNode()
+        # --- v2: 5 new/refocused researcher nodes ---
+        self.company_brief_node = nodes.company_brief_node
+        self.news_signal_node = nodes.news_signal_node
+        self.flw_analyzer = nodes.flw_analyzer
+        self.contact_finder = nodes.contact_finder
+        self.engagement_finder = nodes.engagement_finder
         # --- End v2 Init ---
         
-        self.collector = Collector()
-        self.curator = Curator()
-        self.enricher = Enricher()
-        self.briefing = Briefing()
-        self.tagger = Tagger()
-        # NOTE: self.editor is correctly removed
+        self.collector = nodes.collector
+        self.curator = nodes.curator
+        self.enricher = nodes.enricher
+        self.briefing = nodes.briefing
+        self.tagger = nodes.tagger
+
+    async def _upload_context_to_gdrive(self, state: ResearchState, company_name: str, msgs: list):
+        """Uploads the merged curated context to the job's Google Drive folder, if one is set."""
+        google_drive_folder_url = state.get("google_drive_folder_url")
+        if google_drive_folder_url:
+            logger.info(f"Google Drive URL found. Compiling full context for upload...")
+            # Consolidate all enriched data from the 5 nodes
+            # (URL keys can repeat across nodes; later nodes win, as before)
+            full_context = {
+                **state.get('curated_company_brief_data', {}),
+                **state.get('curated_news_signal_data', {}),
+                **state.get('curated_flw_data', {}),
+                **state.get('curated_contact_finder_data', {}),
+                **state.get('curated_engagement_finder_data', {}),
+            }
+
+            if full_context:
+                try:
+                    # Call the new utility function
+                    file_name = f"{company_name.replace(' ', '_')}_research_context.json"
+                    # Serialize straight to bytes; indented so the Drive file stays readable
+                    payload = orjson.dumps(full_context, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                    await upload_context_to_gdrive(payload, google_drive_folder_url, file_name)
+                    logger.info(f"Successfully uploaded full context to Google Drive: {file_name}")
+                except Exception as gdrive_exc:
+                    logger.error(f"Failed to upload context to Google Drive: {gdrive_exc}", exc_info=True)
+                    # Don't stop the flow; log this error in process notes
+                    msgs.append(AIMessage(content=f"⚠️ Failed to upload context to Google Drive: {gdrive_exc}"))
+            else:
+                logger.warning("No enriched context found to upload to Google Drive.")
+        else:
+            logger.info("No Google Drive URL provided in state, skipping GDrive upload.")
 
     async def airtable_upload_node(self, state: ResearchState) -> ResearchState:
         """(v2) Uploads final report to Airtable AND raw context to Google Drive."""
@@ -139,66 +404,28 @@ class Graph:
             job_id = state.get("job_id")
             record_id = state.get("airtable_record_id")
             company_name = state.get("company", "Unknown_Company")
-
-            # --- 1. Google Drive Context Upload ---
-            google_drive_folder_url = state.get("google_drive_folder_url")
-            if google_drive_folder_url:
-                logger.info(f"Google Drive URL found. Compiling full context for upload...")
-                # Consolidate all enriched data from the 5 nodes
-                full_context = {}
-                full_context.update(state.get('curated_company_brief_data', {}))
-                full_context.update(state.get('curated_news_signal_data', {}))
-                full_context.update(state.get('curated_flw_data', {}))
-                full_context.update(state.get('curated_contact_finder_data', {}))
-                full_context.update(state.get('curated_engagement_finder_data', {}))
-                
-                if full_context:
-                    try:
-                        # Call the new utility function
-                        file_name = f"{company_name.replace(' ', '_')}_research_context.json"
-                        await upload_context_to_gdrive(full_context, google_drive_folder_url, file_name)
-                        logger.info(f"Successfully uploaded full context to Google Drive: {file_name}")
-                    except Exception as gdrive_exc:
-                        logger.error(f"Failed to upload context to Google Drive: {gdrive_exc}", exc_info=True)
-                        # Don't stop the flow; log this error in process notes
-                        state.setdefault("messages", []).append(AIMessage(content=f"⚠️ Failed to upload context to Google Drive: {gdrive_exc}"))
-                else:
-                    logger.warning("No enriched context found to upload to Google Drive.")
-            else:
-                logger.info("No Google Drive URL provided in state, skipping GDrive upload.")
-            # --- End Google Drive Logic ---
+            msgs = state.setdefault("messages", [])
 
             # --- 2. Airtable Upload Preparation ---
             # Build Process Notes
-            process_notes = []
-            queries_found = False
-            for message in state.get("messages", []):
-                content = getattr(message, 'content', '')
-                if isinstance(content, str):
-                    if content.startswith("🔍 Subqueries"):
-                        if not queries_found:
-                            process_notes.append("--- Queries Generated ---")
-                            queries_found = True
-                        queries = content.split('\n', 1)[-1] if '\n' in content else content
-                        process_notes.append(queries)
-                    elif any(keyword in content.lower() for keyword in [
-                        "curating", "document kept", "no relevant documents",
-                        "enriching", "extracting content", "enrichment complete",
-                        "briefing for", "briefing start", "briefing complete",
-                        "compiling", "classification", "classifying",
-                        "editor bypassed" # Updated keyword
-                    ]):
-                         process_notes.append(content)
-            if not process_notes:
-                 process_notes.append(f"Final Report Uploaded on {datetime.now().isoformat()} (Job ID: {job_id})")
-            process_notes_str = "\n".join(process_notes)
+            # (researchers log their sub-queries; curator, enricher, tagger and
+            # raw compiler record their notes)
+            queries: List[str] = []
+            if subqueries := state.get("subqueries_log"):
+                 queries = ["--- Queries Generated ---", *subqueries]
+            process_notes_str = (
+                "\n".join(queries + state.get("process_notes", []))
+                or f"Final Report Uploaded on {datetime.now().isoformat()} (Job ID: {job_id})"
+            )
 
             # Build References (logic unchanged, curator feeds this)
-            references_str = ""
+            # Reuse the section formatted by the raw compiler; only re-format if it is missing
+            cached_refs = state.get("references_formatted_cached")
+            references_str = cached_refs.replace("## References\n", "").strip() if cached_refs else ""
             references_list = state.get("references", [])
-            reference_info = state.get("reference_info", {})
-            reference_titles = state.get("reference_titles", {})
-            if references_list:
+            if references_list and cached_refs is None:
+                reference_info = state.get("reference_info", {})
+                reference_titles = state.get("reference_titles", {})
                 try:
                     references_str = format_references_section(references_list, reference_info, reference_titles)
                     references_str = references_str.replace("## References\n", "").strip()
@@ -210,44 +437,39 @@ class Graph:
             revenue_tag_list = state.get("airtable_revenue_band_est", [])
             revenue_tag = revenue_tag_list[0] if isinstance(revenue_tag_list, list) and revenue_tag_list else None
 
-            report_data = {
-                 "company_name": state.get("company"),
-                 "company_url": state.get("company_url"),
-                 
-                 # --- v2 TAG MAPPINGS ---
-                 "industries_tags": state.get("airtable_industries", []),
-                 "region_tags": state.get("airtable_country_region", []),
-                 "revenue_tags": revenue_tag,
-                 "refed_alignment_tags": state.get("airtable_refed_alignment", []), # NEW
-                 
-                 # --- v2 REPORT/BRIEFING MAPPINGS ---
-                 "report_markdown": state.get("report", ""),
-                 "company_brief_briefing": state.get("company_brief_briefing", ""),         # RENAMED
-                 "news_signal_briefing": state.get("news_signal_briefing", ""),         # RENAMED
-                 "flw_sustainability_briefing": state.get("flw_sustainability_briefing", ""), # KEPT
-                 "contact_briefing": state.get("contact_briefing", ""),               # NEW
-                 "engagement_briefing": state.get("engagement_briefing", ""),           # NEW
-                 # REMOVED: financial_briefing, industry_briefing
-                 
+            report_data = {rk: state.get(sk, default) for rk, sk, default in _AIRTABLE_FIELDS}
+            report_data.update(
+                 revenue_tags=revenue_tag,
                  # --- NOTES/REFERENCES MAPPINGS ---
-                 "process_notes": process_notes_str, 
-                 "references_formatted": references_str, 
-            }
+                 process_notes=process_notes_str,
+                 references_formatted=references_str,
+            )
 
             # Log data being sent (excluding large fields)
-            loggable_report_data = {k: v for k, v in report_data.items() if k not in [
-                "report_markdown", "process_notes", "references_formatted",
-                "company_brief_briefing", "news_signal_briefing", "flw_sustainability_briefing",
-                "contact_briefing", "engagement_briefing"
-            ]}
-            logger.info(f"DEBUG: Data prepared for Airtable: {loggable_report_data}")
-
-            # Call the uploader function
-            upload_result = upload_to_airtable(report_data, job_id, record_id)
-            logger.info(f"Airtable upload result: {upload_result}")
-
-            if upload_result.get("status") == "Success" and upload_result.get("airtable_record_id"):
-                 state["airtable_record_id"] = upload_result.get("airtable_record_id")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "DEBUG: Data prepared for Airtable: %s",
+                    {k: v for k, v in report_data.items() if k not in _LOG_EXCLUDE_FIELDS}
+                )
+
+            # --- 1. Google Drive Context Upload (runs alongside the Airtable upload) ---
+            gdrive_upload = self._upload_context_to_gdrive(state, company_name, msgs)
+
+            # --- 3. Airtable Upload (blocking HTTP, so it runs in a worker thread) ---
+            logger.info(f"Queueing Airtable UPSERT for job {job_id} (record: {record_id or 'match on Organization'})")
+            gdrive_result, upload_result = await asyncio.gather(
+                gdrive_upload,
+                _airtable_batcher.submit({**report_data, 'job_id': job_id, 'airtable_record_id': record_id}),
+                return_exceptions=True
+            )
+            if isinstance(gdrive_result, Exception):
+                logger.error(f"Google Drive upload step failed: {gdrive_result}")
+            if isinstance(upload_result, Exception):
+                logger.error(f"Airtable upload failed: {upload_result}")
+            else:
+                logger.info(f"Airtable upload result: {upload_result}")
+                if upload_result.get("status") == "Success" and upload_result.get("airtable_record_id"):
+                     state["airtable_record_id"] = upload_result.get("airtable_record_id")
 
         except Exception as e:
             logger.error(f"Error during Airtable upload node: {e}", exc_info=True)
@@ -279,18 +501,15 @@ class Graph:
         self.workflow.set_entry_point("grounding")
         self.workflow.set_finish_point("airtable_uploader")
 
-        # --- v2: Define 5 parallel research nodes ---
-        research_nodes = [
-            "company_brief_node", 
-            "news_signal_node", 
-            "flw_analyzer",
-            "contact_finder",
-            "engagement_finder"
-        ]
-        # --- End v2 ---
+        # Fan out: dispatch all 5 researchers as Send branches of a single
+        # superstep so they run concurrently...
+        def dispatch_research(state: ResearchState) -> list[Send]:
+            return [Send(node, state) for node in _PARALLEL_RESEARCH_NODES]
+
+        self.workflow.add_conditional_edges("grounding", dispatch_research, list(_PARALLEL_RESEARCH_NODES))
 
-        for node in research_nodes:
-            self.workflow.add_edge("grounding", node)
+        # ...and fan in: collector runs once, after all 5 have finished
+        for node in _PARALLEL_RESEARCH_NODES:
             self.workflow.add_edge(node, "collector")
 
         self.workflow.add_edge("collector", "curator")
@@ -304,9 +523,13 @@ class Graph:
         
         self.workflow.add_edge("tagger", "airtable_uploader")
 
+        # Compile once; the workflow is fixed for the lifetime of this Graph
+        self._compiled = self.workflow.compile()
+
     async def run(self, thread: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
         """Execute the research workflow"""
-        initial_state_data = self.input_state.copy()
+        initial_state_data = dict(self.input_state)
+        initial_state_data['messages'] = list(self._template_messages)
         # --- v2: Pass GDrive URL from thread config ---
         if 'airtable_record_id' in thread.get("configurable", {}):
              initial_state_data['airtable_record_id'] = thread["configurable"]['airtable_record_id']
@@ -314,66 +537,98 @@ class Graph:
              initial_state_data['google_drive_folder_url'] = thread["configurable"]['google_drive_folder_url']
         # --- End v2 ---
 
-        compiled_graph = self.workflow.compile()
+        compiled_graph = self._compiled
+        send_ws_updates = bool(self.websocket_manager and self.job_id)
+        if send_ws_updates:
+            self._ws_queue = asyncio.Queue(maxsize=self.WS_QUEUE_SIZE)
+            self._last_ws_signature = ()
+            self._ws_sender_task = asyncio.create_task(self._ws_sender())
 
-        async for state_update in compiled_graph.astream(
-            initial_state_data, config=thread
-        ):
-             current_state = list(state_update.values())[0] if state_update else {}
-             if self.websocket_manager and self.job_id:
-                  current_node = list(state_update.keys())[0] if state_update else "unknown"
-                  current_state['current_node'] = str(current_node)
-                  await self._handle_ws_update(current_state)
-             yield current_state
+        try:
+            async for state_update in compiled_graph.astream(
+                initial_state_data, config=thread
+            ):
+                 if state_update:
+                      current_node = next(iter(state_update))
+                      current_state = state_update[current_node]
+                 else:
+                      current_node = "unknown"
+                      current_state = {}
+                 if send_ws_updates:
+                      current_state['current_node'] = str(current_node)
+                      await self._handle_ws_update(current_state)
+                 yield current_state
+
+            # Don't drop the final state update
+            if send_ws_updates:
+                await self._ws_queue.join()
+        finally:
+            if self._ws_sender_task is not None:
+                self._ws_sender_task.cancel()
+                self._ws_sender_task = None
 
     async def _handle_ws_update(self, state: Dict[str, Any]):
         """Handle WebSocket updates based on state changes"""
+        job_id_to_use = state.get('job_id', self.job_id)
+        if not job_id_to_use:
+             logger.warning("Could not send WebSocket update: job_id missing in state.")
+             return
+        # Nobody is listening: skip building the update
+        if not self.websocket_manager.has_subscribers(job_id_to_use):
+             return
         current_node_name = state.get("current_node", "unknown")
+        progress = self._calculate_progress(current_node_name)
+        signature = (current_node_name, progress, len(state))
+        if signature == self._last_ws_signature:
+            return
+        self._last_ws_signature = signature
         update = {
             "type": "state_update",
             "data": {
                 "current_node": current_node_name,
-                "progress": self._calculate_progress(current_node_name),
+                "progress": progress,
                 "keys": list(state.keys())
             }
         }
-        job_id_to_use = state.get('job_id', self.job_id)
-        if job_id_to_use:
-             await self.websocket_manager.broadcast_to_job(job_id_to_use, update)
-        else:
-             logger.warning("Could not send WebSocket update: job_id missing in state.")
+        self._enqueue_ws_update((job_id_to_use, update))
+
+    def _enqueue_ws_update(self, item: tuple[str, Dict[str, Any]]):
+        """Queues an update, dropping the oldest one if the queue is full."""
+        queue = self._ws_queue
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Progress updates are idempotent, losing a stale one is fine
+            queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(item)
+
+    async def _ws_sender(self):
+        """Sends queued updates, coalescing bursts to the latest one per WS_UPDATE_INTERVAL."""
+        queue = self._ws_queue
+        while True:
+            job_id, update = await queue.get()
+            taken = 1
+            while not queue.empty():
+                job_id, update = queue.get_nowait()
+                taken += 1
+            try:
+                await self.websocket_manager.broadcast_to_job(job_id, update)
+            except Exception as e:
+                logger.error(f"Error sending WebSocket state update: {e}")
+            finally:
+                for _ in range(taken):
+                    queue.task_done()
+            await asyncio.sleep(self.WS_UPDATE_INTERVAL)
 
     def _calculate_progress(self, current_node_name: str) -> int:
         """Estimates progress based on the current node."""
-        node_order = [
-            "grounding", 
-            "company_brief_node", # Use one of the parallel nodes as the marker
-            "collector", "curator", "enricher", "briefing",
-            "raw_compiler", "tagger", "airtable_uploader", "__end__"
-        ]
-        try:
-             base_index = -1
-             # --- v2: Update parallel node list ---
-             if current_node_name in [
-                 "company_brief_node", "news_signal_node", "flw_analyzer", 
-                 "contact_finder", "engagement_finder"
-                ]:
-                 base_index = node_order.index("company_brief_node")
-             # --- End v2 ---
-             elif current_node_name in node_order:
-                  base_index = node_order.index(current_node_name)
-
-             if base_index != -1:
-                  progress = int(((base_index + 1) / (len(node_order) - 1)) * 100)
-                  return min(progress, 100)
-             else:
-                  logger.warning(f"Node '{current_node_name}' not found for progress calculation.")
-                  return 0
-        except ValueError:
-             logger.warning(f"Error finding node '{current_node_name}' for progress calculation.")
-             return 0
+        progress = self._PROGRESS_TABLE.get(current_node_name)
+        if progress is None:
+            logger.warning(f"Node '{current_node_name}' not found for progress calculation.")
+            return 0
+        return progress
 
     def compile(self):
-        """Compiles the graph."""
-        graph = self.workflow.compile()
-        return graph
\ No newline at end of file
+        """Returns the compiled graph (built once in _build_workflow)."""
+        return self._compiled
\ No newline at end of file
@@ -1,87 +1,39 @@
 # backend/nodes/briefing.py
 import asyncio
+import hashlib
+import heapq
+import io
 import logging
 import os
-from typing import Any, Dict, List, Union
+import random
+import time
+from html.parser import HTMLParser
+from operator import itemgetter
+from typing import Any, Dict, List, Set, Union
 
 import google.generativeai as genai
+from cachetools import LRUCache
+from google.api_core import exceptions as google_exceptions
 
 # Assuming ResearchState is in ../classes/state.py relative to this file
 from ..classes import ResearchState
+from ..utils.blocking import run_blocking
 # Import the Airtable update function
 from backend.airtable_uploader import update_airtable_record # synchronous function
 
 logger = logging.getLogger(__name__)
 
-class Briefing:
-    """(v2) Creates polished briefings for each of the 5 v2 research categories."""
-
-    def __init__(self) -> None:
-        self.max_doc_length = 8000  # Maximum document content length per doc
-        self.max_total_length = 120000 # Max total characters to send to Gemini
-        self.gemini_key = os.getenv("GEMINI_API_KEY")
-        if not self.gemini_key:
-            raise ValueError("GEMINI_API_KEY environment variable is not set")
-
-        # Configure Gemini
-        genai.configure(api_key=self.gemini_key)
-        self.gemini_model = genai.GenerativeModel('gemini-1.5-flash') # Use Flash for speed/context
-        logger.info("Briefing node initialized with Gemini model.")
-    
-    # --- MODIFIED HELPER METHOD to use asyncio.to_thread ---
-    async def _update_airtable_status(self, record_id: str, status_text: str):
-        """Helper to call the synchronous update function in a separate thread."""
-        if not record_id:
-            logger.warning("Airtable status update skipped: No record ID provided.")
-            return
-        try:
-            # Use asyncio.to_thread to safely run the synchronous Airtable API call
-            await asyncio.to_thread(update_airtable_record, record_id, {'Research Status': status_text})
-            logger.debug(f"Airtable status update successful for record {record_id}")
-        except Exception as e:
-            # Log the error but do not raise, as Airtable update is a secondary task
-            logger.error(f"{self.__class__.__name__} failed to update Airtable status: {e}", exc_info=True)
-    # --- END MODIFIED HELPER METHOD ---
-
-    async def generate_category_briefing(
-        self, docs: Union[Dict[str, Any], List[Dict[str, Any]]],
-        category: str, context: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Generates a briefing for a specific category using curated documents."""
-        company = context.get('company', 'Unknown')
-        industry = context.get('industry', 'Unknown')
-        hq_location = context.get('hq_location', 'Unknown')
-        websocket_manager = context.get('websocket_manager')
-        job_id = context.get('job_id')
 
-        # Normalize docs to handle both dict and list inputs
-        items = list(docs.items()) if isinstance(docs, dict) else [
-            (doc.get('url', f'doc_{i}'), doc) for i, doc in enumerate(docs) if isinstance(doc, dict) # Ensure doc is dict
-        ]
-        num_docs = len(items)
-        logger.info(f"Generating {category} briefing for {company} using {num_docs} documents")
-
-
-        # Send category start status
-        if websocket_manager and job_id:
-            await websocket_manager.send_status_update(
-                job_id=job_id,
-                status="briefing_start",
-                message=f"Generating {category} briefing",
-                result={
-                    "step": "Briefing",
-                    "category": category, # This will be the v2 category name, e.g., 'contact'
-                    "total_docs": num_docs
-                }
-            )
-
-        # --- v2: Define prompts for 5 new nodes ---
-        prompts = {
-            'company_brief': f"""Create a focused Company Brief for {company}, a {industry} company based in {hq_location}.
+# --- v2: Define prompts for 5 new nodes ---
+# The instructions are identical for every company (company details go in
+# the Context block after them), so each prompt starts with a stable
+# prefix that the provider's prompt cache can reuse across jobs.
+_PROMPT_TEMPLATES: Dict[str, str] = {
+    'company_brief': """Create a focused Company Brief for the company described in the Context section.
 Key requirements:
 1. Structure using these exact headers. Use only bullet points under headers.
 ### Core Business
-* Conccisely summarize {company}'s primary products, services, and mission.
+* Conccisely summarize the company's primary products, services, and mission.
 ### Financial Health
 * List any "ballpark" revenue figures (e.g., "$100M-$500M", "Est. $1B+").
 * List any "financial health signals" found (e.g., "Recent layoffs reported", "Stock price drop", "Secured new funding").
@@ -90,7 +42,7 @@ Key requirements:
 4. NEVER state "no information found" or "data not available".
 5. Provide only the briefing content in markdown format. No explanations or commentary.
 """,
-            'news_signal': f"""Create a "News & Signals" briefing for {company}.
+    'news_signal': """Create a "News & Signals" briefing for the company.
 Key requirements:
 1. Structure using ONLY bullet points (*). DO NOT use ### headers.
 2. Scan documents for specific, actionable signals from the last 12-18 months.
@@ -103,7 +55,7 @@ Key requirements:
 5. If no information is found for a category bullet, OMIT that bullet entirely.
 6. Provide only the briefing content as a single bulleted list. No explanation or commentary.
 """,
-            'flw': f"""Create a focused briefing on {company}'s Food Loss & Waste (FLW) and Sustainability efforts.
+    'flw': """Create a focused briefing on the company's Food Loss & Waste (FLW) and Sustainability efforts.
 Key Requirements:
 1. Structure using these exact headers ONLY IF relevant information is found. Use only bullet points under headers.
 ### ESG & Methane Goals
@@ -122,7 +74,7 @@ Key Requirements:
 4. NEVER state "no information found".
 5. Provide only the briefing content in markdown format. No explanations or commentary.
 """,
-            'contact': f"""Create a "Potential Contacts" briefing for {company}.
+    'contact': """Create a "Potential Contacts" briefing for the company.
 Key Requirements:
 1. Structure using the exact header: ### Key Contacts
 2. List relevant mid-level contacts (e.g., in Sustainability, Impact, CSR, Community Relations) found in the documents.
@@ -131,7 +83,7 @@ Key Requirements:
 5. If no relevant contacts are found, OMIT the header and output nothing.
 6. Provide only the briefing content in markdown format. No explanations or commentary.
 """,
-            'engagement': f"""Create an "Engagements & Affiliations" briefing for {company}.
+    'engagement': """Create an "Engagements & Affiliations" briefing for the company.
 Key Requirements:
 1. Structure using the exact header: ### Engagements & Affiliations
 2. List all signals of external engagement, partnerships, and memberships.
@@ -145,55 +97,283 @@ Key Requirements:
 4. If no signals are found, OMIT the header and output nothing.
 5. Provide only the briefing content in markdown format. No explanations or commentary.
 """
-        }
-        # --- END v2 PROMPTS ---
+}
+# Fallback for an unknown category
+_DEFAULT_PROMPT_TEMPLATE = "Create a focused research briefing on {category} for the company based on the provided documents.\n"
+# --- END v2 PROMPTS ---
+
+
+def _doc_score(doc: Dict[str, Any]) -> float:
+    """A curated document's overall evaluation score; 0 if missing or malformed."""
+    try:
+        return float((doc.get('evaluation') or {}).get('overall_score', 0) or 0)
+    except (TypeError, ValueError, AttributeError):
+        return 0.0
+
+
+# Strong references to fire-and-forget sends so they aren't collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _send_in_background(websocket_manager, **update) -> None:
+    """Sends a status update without making the caller wait for the websocket write."""
+    task = asyncio.create_task(websocket_manager.send_status_update(**update))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+class _TextExtractor(HTMLParser):
+    """Collects visible text, skipping scripts, styles and page chrome."""
+
+    SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'svg'})
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            text = data.strip()
+            if text:
+                self.parts.append(text)
+
+
+# Stripped text of HTML documents keyed by a digest of the markup, so retries
+# and repeat jobs don't re-parse it. Kept here rather than on the doc dicts,
+# which live in state and are exported to Google Drive.
+_CLEAN_TEXT_CACHE: LRUCache = LRUCache(maxsize=512)
+
+
+def _clean_doc_content(doc: Dict[str, Any]) -> str:
+    """Returns the doc's content with HTML markup stripped; plain text is returned as is."""
+    content = doc.get('raw_content') or doc.get('content', '')
+    if not isinstance(content, str):
+        content = str(content)
+    if not content.lstrip().startswith('<'):
+        return content
+    key = hashlib.blake2b(content.encode('utf-8', 'ignore'), digest_size=16).digest()
+    if (cached := _CLEAN_TEXT_CACHE.get(key)) is not None:
+        return cached
+    try:
+        extractor = _TextExtractor()
+        extractor.feed(content)
+        extractor.close()
+        content = ' '.join(extractor.parts)
+    except Exception as e:
+        logger.warning(f"Could not strip HTML from {doc.get('url', 'document')}: {e}")
+        return content
+    _CLEAN_TEXT_CACHE[key] = content
+    return content
+
+
+class _GeminiRateLimiter:
+    """
+    Leaky-bucket limiter allowing max_rate Gemini calls per period, in bursts of
+    up to max_rate. The rate halves on a 429 and creeps back by one per success.
+    """
+
+    def __init__(self, max_rate: int, period: float = 60.0):
+        self.configured_rate = max(1, max_rate)
+        self.max_rate = self.configured_rate
+        self.period = period
+        self._level = 0.0
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _leak(self):
+        now = time.monotonic()
+        self._level = max(0.0, self._level - (now - self._last) * self.max_rate / self.period)
+        self._last = now
+
+    async def acquire(self):
+        """Waits until one more call fits in the bucket."""
+        async with self._lock:
+            while True:
+                self._leak()
+                if self._level + 1 <= self.max_rate:
+                    self._level += 1
+                    return
+                await asyncio.sleep((self._level + 1 - self.max_rate) * self.period / self.max_rate)
+
+    def throttle(self):
+        self.max_rate = max(1, self.max_rate // 2)
+
+    def recover(self):
+        self.max_rate = min(self.configured_rate, self.max_rate + 1)
 
-        # Select the appropriate prompt, default to a generic one if category unknown
-        prompt_template = prompts.get(category, f'Create a focused research briefing on {category} for {company} based on the provided documents.')
 
-        # Sort documents by evaluation score (highest first)
+class Briefing:
+    """(v2) Creates polished briefings for each of the 5 v2 research categories."""
+
+    MAX_GEMINI_ATTEMPTS = 3
+
+    # Same for every call; built once instead of per category
+    GENERATION_CONFIG = genai.types.GenerationConfig(
+        temperature=0.1,
+        max_output_tokens=8192
+    )
+    SAFETY_SETTINGS = {
+        'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
+        'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
+        'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
+        'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
+    }
+
+    def __init__(self) -> None:
+        self.max_doc_length = 8000  # Maximum document content length per doc
+        self.max_total_length = 120000 # Max total characters to send to Gemini
+        self.gemini_key = os.getenv("GEMINI_API_KEY")
+        if not self.gemini_key:
+            raise ValueError("GEMINI_API_KEY environment variable is not set")
+
+        # Configure Gemini
+        genai.configure(api_key=self.gemini_key)
+        self.gemini_model = genai.GenerativeModel('gemini-1.5-flash') # Use Flash for speed/context
+        # Calls per minute across all jobs (the node is process-wide); all 5
+        # categories fire at once as long as the quota allows
+        self._rate_limiter = _GeminiRateLimiter(int(os.getenv("GEMINI_RPM", "15")))
+        # Briefings by prompt hash; the node is shared by every job in the process
+        self._response_cache: LRUCache = LRUCache(maxsize=1024)
+        logger.info("Briefing node initialized with Gemini model.")
+    
+    # --- MODIFIED HELPER METHOD to run off the event loop ---
+    async def _update_airtable_status(self, record_id: str, status_text: str):
+        """Helper to call the synchronous update function in a separate thread."""
+        if not record_id:
+            logger.warning("Airtable status update skipped: No record ID provided.")
+            return
         try:
-             sorted_items = sorted(
-                 items,
-                 key=lambda x: float(x[1].get('evaluation', {}).get('overall_score', 0)) if isinstance(x[1], dict) else 0,
-                 reverse=True
-             )
-        except Exception as sort_exc:
-             logger.error(f"Error sorting documents for {category}: {sort_exc}. Proceeding with unsorted docs.")
-             sorted_items = items # Fallback to unsorted
-
-        # Prepare document text, limiting length
-        doc_texts = []
-        total_length = 0
-        separator = "\n" + "-" * 40 + "\n"
-        for _, doc in sorted_items:
-             if not isinstance(doc, dict):
-                  logger.warning(f"Skipping non-dictionary item during doc text preparation for {category}.")
-                  continue
+            await run_blocking(update_airtable_record, record_id, {'Research Status': status_text})
+            logger.debug(f"Airtable status update successful for record {record_id}")
+        except Exception as e:
+            # Log the error but do not raise, as Airtable update is a secondary task
+            logger.error(f"{self.__class__.__name__} failed to update Airtable status: {e}", exc_info=True)
+    # --- END MODIFIED HELPER METHOD ---
 
-             title = doc.get('title', '')
-             content = doc.get('raw_content') or doc.get('content', '')
+    async def _generate_with_retry(self, prompt: str, category: str, websocket_manager=None, job_id=None):
+        """
+        Streams a Gemini briefing under the rate limiter, forwarding each chunk as a
+        briefing_progress update. 429s are retried with jittered backoff as long as
+        nothing has been streamed yet. Returns (content, response).
+        """
+        for attempt in range(1, self.MAX_GEMINI_ATTEMPTS + 1):
+            await self._rate_limiter.acquire()
+            buf = io.StringIO()
+            try:
+                response = await self.gemini_model.generate_content_async( 
+                     prompt,
+                     generation_config=self.GENERATION_CONFIG,
+                     safety_settings=self.SAFETY_SETTINGS,
+                     request_options={'timeout': 300},
+                     stream=True
+                )
+                async for chunk in response:
+                    delta = "".join(part.text for part in chunk.parts if hasattr(part, 'text'))
+                    if not delta:
+                        continue
+                    buf.write(delta)
+                    if websocket_manager and job_id:
+                        await websocket_manager.send_status_update(
+                            job_id=job_id, status="briefing_progress",
+                            message=f"Generating {category} briefing",
+                            result={ "step": "Briefing", "category": category, "delta": delta }
+                        )
+            except google_exceptions.ResourceExhausted:
+                self._rate_limiter.throttle()
+                if attempt == self.MAX_GEMINI_ATTEMPTS or buf.tell():
+                    raise
+                delay = 2 ** attempt + random.uniform(0, 1)
+                logger.warning(f"Gemini quota exceeded for {category} briefing; lowering rate to {self._rate_limiter.max_rate}/min and retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            else:
+                self._rate_limiter.recover()
+                return buf.getvalue().strip(), response
 
-             if not isinstance(content, str):
-                  content = str(content) 
-             if len(content) > self.max_doc_length:
-                  content = content[:self.max_doc_length] + "... [content truncated]"
+    async def generate_category_briefing(
+        self, docs: Union[Dict[str, Any], List[Dict[str, Any]]],
+        category: str, context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generates a briefing for a specific category using curated documents."""
+        company = context.get('company', 'Unknown')
+        industry = context.get('industry', 'Unknown')
+        hq_location = context.get('hq_location', 'Unknown')
+        websocket_manager = context.get('websocket_manager')
+        job_id = context.get('job_id')
+
+        # Normalize docs to handle both dict and list inputs
+        items = list(docs.items()) if isinstance(docs, dict) else [
+            (doc.get('url', f'doc_{i}'), doc) for i, doc in enumerate(docs) if isinstance(doc, dict) # Ensure doc is dict
+        ]
+        num_docs = len(items)
+        logger.info(f"Generating {category} briefing for {company} using {num_docs} documents")
+        # (The category's briefing_start update is sent by create_briefings)
 
-             doc_url = doc.get('url', 'Unknown Source')
-             doc_entry = f"Source URL: {doc_url}\nTitle: {title}\n\nContent: {content}"
 
-             entry_len = len(doc_entry) + len(separator)
+        # Select the appropriate prompt, default to a generic one if category unknown
+        prompt_template = _PROMPT_TEMPLATES.get(category) or _DEFAULT_PROMPT_TEMPLATE.format(category=category)
+
+        separator = "\n" + "-" * 40 + "\n"
+        # Fixed text around each entry: "Source URL: ", "\nTitle: ", "\n\nContent: " and the separator
+        entry_overhead = 12 + 8 + 11 + len(separator)
+
+        # Score each document once, then take the best ones (highest first, ties
+        # in input order). No more than max_total_length // entry_overhead can fit.
+        scored = [(_doc_score(doc), doc) for _, doc in items if isinstance(doc, dict)]
+        if len(scored) < num_docs:
+             logger.warning(f"Skipping {num_docs - len(scored)} non-dictionary items during doc text preparation for {category}.")
+        top_docs = heapq.nlargest(self.max_total_length // entry_overhead, scored, key=itemgetter(0))
+
+        # Prepare document text, limiting length; entries go straight into one buffer
+        docs_buf = io.StringIO()
+        doc_count = 0
+        total_length = 0
+        seen = set() # Digests of packed text; mirrored articles under different URLs are packed once
+        for _, doc in top_docs:
+             title = str(doc.get('title', ''))
+             # Markup is stripped before the length cap so the budget goes to text
+             content = _clean_doc_content(doc)
+             if len(content) > self.max_doc_length:
+                  content = content[:self.max_doc_length] + "... [content truncated]"
+             if content:
+                  # Hash all of the text that would be packed: crawled pages from one
+                  # site often share a long nav/header prefix but differ after it
+                  sig = hashlib.blake2b(content.encode('utf-8', 'ignore'), digest_size=16).digest()
+                  if sig in seen:
+                       logger.debug(f"Skipping duplicate content from {doc.get('url', 'Unknown Source')} in {category} briefing.")
+                       continue
+                  seen.add(sig)
+
+             doc_url = str(doc.get('url', 'Unknown Source'))
+
+             entry_len = len(doc_url) + len(title) + len(content) + entry_overhead
              if total_length + entry_len < self.max_total_length:
-                 doc_texts.append(doc_entry)
+                 if doc_count:
+                     docs_buf.write(separator)
+                 docs_buf.write("Source URL: ")
+                 docs_buf.write(doc_url)
+                 docs_buf.write("\nTitle: ")
+                 docs_buf.write(title)
+                 docs_buf.write("\n\nContent: ")
+                 docs_buf.write(content)
+                 doc_count += 1
                  total_length += entry_len
              else:
                  logger.warning(f"Reached max total length ({self.max_total_length} chars). Truncating documents for {category} briefing.")
                  break 
 
-        if not doc_texts:
+        if not doc_count:
              logger.warning(f"No document content available to generate briefing for {category}.")
              if websocket_manager and job_id:
-                  await websocket_manager.send_status_update(
+                  _send_in_background(websocket_manager,
                       job_id=job_id, status="briefing_complete",
                       message=f"No content for {category} briefing",
                       result={ "step": "Briefing", "category": category, "success": False }
@@ -201,59 +381,54 @@ Key Requirements:
              return {'content': ''}
 
         # --- v2: Add Polishing Instructions to main prompt ---
+        # Static instructions first, then the per-company context, then the documents
         full_prompt = f"""{prompt_template}
-
----
-Documents for Analysis:
-{separator.join(doc_texts)}
----
-
 **Polishing Instructions:**
 As you write the briefing, ensure clean markdown, remove any redundancies, and write in clear, professional language. 
 This briefing will be used directly in a report, so do not include any preamble, conversation, or meta-commentary.
 Output ONLY the requested markdown content.
+
+---
+Context:
+Company: {company}
+Industry: {industry}
+Headquarters: {hq_location}
+
+---
+Documents for Analysis:
+{docs_buf.getvalue()}
+---
 """
         # --- End v2 Polishing ---
         
         logger.debug(f"Prompt length for {category}: {len(full_prompt)} characters.")
 
-        try:
-            logger.info(f"Sending prompt to Gemini for {category} briefing ({len(doc_texts)} docs).")
-            generation_config = genai.types.GenerationConfig(
-                 temperature=0.1, 
-                 max_output_tokens=8192
-            )
-            safety_settings = { 
-                 'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
-                 'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
-                 'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
-                 'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
-            }
-            response = await self.gemini_model.generate_content_async( 
-                 full_prompt,
-                 generation_config=generation_config,
-                 safety_settings=safety_settings,
-                 request_options={'timeout': 300} 
-            )
+        # Identical prompts (retries, re-runs on unchanged documents) reuse the earlier response
+        cache_key = hashlib.blake2b(full_prompt.encode('utf-8'), digest_size=16).hexdigest()
 
-            content = ""
-            if response and response.parts:
-                 content = "".join(part.text for part in response.parts if hasattr(part, 'text')).strip()
-            
-            if not content:
-                 finish_reason = response.prompt_feedback.block_reason if response.prompt_feedback else "Unknown"
-                 logger.error(f"Empty response from LLM for {category} briefing. Finish Reason: {finish_reason}")
-                 if websocket_manager and job_id:
-                      await websocket_manager.send_status_update(
-                          job_id=job_id, status="briefing_complete",
-                          message=f"LLM failed for {category} briefing",
-                          result={ "step": "Briefing", "category": category, "success": False, "error": f"LLM Error: {finish_reason}" }
-                      )
-                 return {'content': ''}
+        try:
+            content = self._response_cache.get(cache_key, "")
+            if content:
+                logger.info(f"Reusing cached {category} briefing ({doc_count} docs).")
+            else:
+                logger.info(f"Sending prompt to Gemini for {category} briefing ({doc_count} docs).")
+                content, response = await self._generate_with_retry(full_prompt, category, websocket_manager, job_id)
+
+                if not content:
+                     finish_reason = response.prompt_feedback.block_reason if response.prompt_feedback else "Unknown"
+                     logger.error(f"Empty response from LLM for {category} briefing. Finish Reason: {finish_reason}")
+                     if websocket_manager and job_id:
+                          _send_in_background(websocket_manager,
+                              job_id=job_id, status="briefing_complete",
+                              message=f"LLM failed for {category} briefing",
+                              result={ "step": "Briefing", "category": category, "success": False, "error": f"LLM Error: {finish_reason}" }
+                          )
+                     return {'content': ''}
+                self._response_cache[cache_key] = content
 
             logger.info(f"Successfully generated {category} briefing (Length: {len(content)} characters)")
             if websocket_manager and job_id:
-                await websocket_manager.send_status_update(
+                _send_in_background(websocket_manager,
                     job_id=job_id,
                     status="briefing_complete",
                     message=f"Completed {category} briefing",
@@ -268,7 +443,7 @@ Output ONLY the requested markdown content.
         except Exception as e:
             logger.error(f"Error generating {category} briefing via LLM: {e}", exc_info=True)
             if websocket_manager and job_id:
-                 await websocket_manager.send_status_update(
+                 _send_in_background(websocket_manager,
                      job_id=job_id, status="briefing_complete",
                      message=f"Error generating {category} briefing",
                      result={ "step": "Briefing", "category": category, "success": False, "error": str(e) }
@@ -330,32 +505,45 @@ Output ONLY the requested markdown content.
 
         # Process briefings in parallel if tasks were prepared
         if briefing_tasks_details:
-            briefing_semaphore = asyncio.Semaphore(3) # Limit to 3 concurrent Gemini calls
+            # Announce every category up front, sending the start updates concurrently
+            if websocket_manager and job_id:
+                await asyncio.gather(*(
+                    websocket_manager.send_status_update(
+                        job_id=job_id,
+                        status="briefing_start",
+                        message=f"Generating {task['category']} briefing",
+                        result={
+                            "step": "Briefing",
+                            "category": task['category'], # This will be the v2 category name, e.g., 'contact'
+                            "total_docs": len(task['curated_data'])
+                        }
+                    )
+                    for task in briefing_tasks_details
+                ))
 
             async def process_briefing(task_details: Dict[str, Any]) -> Dict[str, Any]:
-                """Process a single briefing with rate limiting."""
-                async with briefing_semaphore:
-                    result = await self.generate_category_briefing(
-                        task_details['curated_data'],
-                        task_details['category'],
-                        context
-                    )
+                """Process a single briefing (Gemini calls are rate limited per minute)."""
+                result = await self.generate_category_briefing(
+                    task_details['curated_data'],
+                    task_details['category'],
+                    context
+                )
 
-                    briefing_content = result.get('content', '')
-                    success = bool(briefing_content) 
+                briefing_content = result.get('content', '')
+                success = bool(briefing_content) 
 
-                    state[task_details['briefing_key']] = briefing_content
-                    if success:
-                         briefings[task_details['category']] = briefing_content
-                         logger.info(f"Completed {task_details['category']} briefing ({len(briefing_content)} chars)")
-                    else:
-                         logger.error(f"Failed to generate briefing for {task_details['category']} using {task_details['data_field']}")
+                state[task_details['briefing_key']] = briefing_content
+                if success:
+                     briefings[task_details['category']] = briefing_content
+                     logger.info(f"Completed {task_details['category']} briefing ({len(briefing_content)} chars)")
+                else:
+                     logger.error(f"Failed to generate briefing for {task_details['category']} using {task_details['data_field']}")
 
-                    return {
-                        'category': task_details['category'],
-                        'success': success,
-                        'length': len(briefing_content)
-                    }
+                return {
+                    'category': task_details['category'],
+                    'success': success,
+                    'length': len(briefing_content)
+                }
 
             logger.info(f"Starting execution of {len(briefing_tasks_details)} briefing tasks.")
             results = await asyncio.gather(*[
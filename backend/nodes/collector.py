@@ -5,6 +5,7 @@ import logging
 from urllib.parse import urlparse # Ensure urlparse is imported
 
 from ..classes import ResearchState
+from ..utils.blocking import run_blocking
 from backend.airtable_uploader import update_airtable_record # synchronous function
 
 
@@ -14,15 +15,15 @@ logger = logging.getLogger(__name__)
 class Collector:
     """Collects and organizes all research data before curation."""
 
-    # --- MODIFIED HELPER METHOD to use asyncio.to_thread ---
+    # --- MODIFIED HELPER METHOD to use run_blocking ---
     async def _update_airtable_status(self, record_id: str, status_text: str):
         """Helper to call the synchronous update function in a separate thread."""
         if not record_id:
             logger.warning("Airtable status update skipped: No record ID provided.")
             return
         try:
-            # Use asyncio.to_thread to safely run the synchronous Airtable API call
-            await asyncio.to_thread(update_airtable_record, record_id, {'Research Status': status_text})
+            # Use run_blocking to safely run the synchronous Airtable API call
+            await run_blocking(update_airtable_record, record_id, {'Research Status': status_text})
             logger.debug(f"Airtable status update successful for record {record_id}")
         except Exception as e:
             # Log the error but do not raise, as Airtable update is a secondary task
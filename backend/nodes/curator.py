@@ -7,6 +7,7 @@ from urllib.parse import urlparse
 from langchain_core.messages import AIMessage
 
 from ..classes import ResearchState
+from ..utils.blocking import run_blocking
 from ..utils.references import process_references_from_search_results
 from backend.airtable_uploader import update_airtable_record # synchronous function
 
@@ -294,8 +295,10 @@ class Curator:
 
         # Update final message list in state
         messages = state.get('messages', [])
-        messages.append(AIMessage(content="\n".join(msg)))
+        summary = "\n".join(msg)
+        messages.append(AIMessage(content=summary))
         state['messages'] = messages
+        state.setdefault('process_notes', []).append(summary) # Kept for Airtable "Process Notes"
 
         # Send final curation stats via WebSocket using the counts from this run
         if websocket_manager and job_id:
@@ -318,8 +321,8 @@ class Curator:
             logger.warning("Airtable status update skipped: No record ID provided.")
             return
         try:
-            # Use asyncio.to_thread to safely run the synchronous Airtable API call
-            await asyncio.to_thread(update_airtable_record, record_id, {'Research Status': status_text})
+            # Use run_blocking to safely run the synchronous Airtable API call
+            await run_blocking(update_airtable_record, record_id, {'Research Status': status_text})
             logger.debug(f"Airtable status update successful for record {record_id}")
         except Exception as e:
             # Log the error but do not raise, as Airtable update is a secondary task
@@ -1,36 +1,67 @@
 # backend/nodes/grounding.py
 import logging
 import os
-import asyncio
+from cachetools import TTLCache
 from langchain_core.messages import AIMessage
 from tavily import AsyncTavilyClient
 
 from ..classes import InputState, ResearchState
+from ..utils.blocking import run_blocking
 from backend.airtable_uploader import update_airtable_record # synchronous function
 
 logger = logging.getLogger(__name__)
 
+# Website crawls keyed by URL, shared across jobs so retries and repeat
+# requests for the same company skip the Tavily crawl
+_SITE_SCRAPE_CACHE: TTLCache = TTLCache(maxsize=128, ttl=3600)
+
 class GroundingNode:
     """Gathers initial grounding data about the company."""
     
     def __init__(self) -> None:
         self.tavily_client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
 
-    # --- MODIFIED HELPER METHOD to use asyncio.to_thread ---
+    # --- MODIFIED HELPER METHOD to use run_blocking ---
     async def _update_airtable_status(self, record_id: str, status_text: str):
         """Helper to call the synchronous update function in a separate thread."""
         if not record_id:
             logger.warning("Airtable status update skipped: No record ID provided.")
             return
         try:
-            # Use asyncio.to_thread to safely run the synchronous Airtable API call
-            await asyncio.to_thread(update_airtable_record, record_id, {'Research Status': status_text})
+            # Use run_blocking to safely run the synchronous Airtable API call
+            await run_blocking(update_airtable_record, record_id, {'Research Status': status_text})
             logger.debug(f"Airtable status update successful for record {record_id}")
         except Exception as e:
             # Log the error but do not raise, as Airtable update is a secondary task
             logger.error(f"{self.__class__.__name__} failed to update Airtable status for record {record_id}: {e}", exc_info=True)
     # --- END MODIFIED HELPER METHOD ---
 
+    async def _crawl_site(self, url: str) -> dict:
+        """Crawls the company website, reusing a cached crawl of the same URL."""
+        if (cached := _SITE_SCRAPE_CACHE.get(url)) is not None:
+            logger.info(f"Using cached website crawl for {url}")
+        else:
+            logger.info("Initiating Tavily crawl")
+            site_extraction = await self.tavily_client.crawl(
+                url=url, 
+                instructions="Find any pages that will help us understand the company's business, products, services, and any other relevant information.",
+                max_depth=1, 
+                max_breadth=50, 
+                extract_depth="advanced"
+            )
+            cached = {}
+            for item in site_extraction.get("results", []):
+                if item.get("raw_content"):
+                    page_url = item.get("url", url)
+                    cached[page_url] = {
+                        'raw_content': item.get('raw_content'),
+                        'source': 'company_website'
+                    }
+            if cached:
+                _SITE_SCRAPE_CACHE[url] = cached
+        # Downstream nodes annotate these documents, so hand out fresh copies
+        return {page_url: dict(doc) for page_url, doc in cached.items()}
+
     async def initial_search(self, state: InputState) -> ResearchState:
         # Add debug logging at the start to check websocket manager
         if websocket_manager := state.get('websocket_manager'):
@@ -68,23 +99,7 @@ class GroundingNode:
                     )
 
             try:
-                logger.info("Initiating Tavily crawl")
-                site_extraction = await self.tavily_client.crawl(
-                    url=url, 
-                    instructions="Find any pages that will help us understand the company's business, products, services, and any other relevant information.",
-                    max_depth=1, 
-                    max_breadth=50, 
-                    extract_depth="advanced"
-                )
-                
-                site_scrape = {}
-                for item in site_extraction.get("results", []):
-                    if item.get("raw_content"):
-                        page_url = item.get("url", url)
-                        site_scrape[page_url] = {
-                            'raw_content': item.get('raw_content'),
-                            'source': 'company_website'
-                        }
+                site_scrape = await self._crawl_site(url)
                 
                 if site_scrape:
                     logger.info(f"Successfully crawled {len(site_scrape)} pages from website")
@@ -155,6 +170,9 @@ class GroundingNode:
             # Initialize research fields
             "messages": [AIMessage(content=msg)],
             "site_scrape": site_scrape,
+            # Fresh per run; the parallel researchers append their sub-queries to
+            # this list in place, so it must exist before they are dispatched
+            "subqueries_log": [],
             # Pass through websocket info
             "websocket_manager": state.get('websocket_manager'),
             "job_id": state.get('job_id'),
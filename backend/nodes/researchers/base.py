@@ -4,10 +4,10 @@ import os
 from datetime import datetime
 from typing import Any, Dict, List
 
-from openai import AsyncOpenAI
 from tavily import AsyncTavilyClient
 
 from ...classes import ResearchState
+from ...utils.http_clients import get_openai_client
 from ...utils.references import clean_title
 
 logger = logging.getLogger(__name__)
@@ -21,7 +21,7 @@ class BaseResearcher:
             raise ValueError("Missing API keys")
             
         self.tavily_client = AsyncTavilyClient(api_key=tavily_key)
-        self.openai_client = AsyncOpenAI(api_key=openai_key)
+        self.openai_client = get_openai_client(openai_key)
         self.analyst_type = "base_researcher"  # Default type
 
     @property
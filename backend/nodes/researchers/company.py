@@ -26,10 +26,12 @@ class CompanyBriefNode(BaseResearcher):
         """)
 
         # Add message to show subqueries with emojis
-        subqueries_msg = "🔍 Subqueries for company brief:\n" + "\n".join([f"• {query}" for query in queries])
+        queries_text = "\n".join([f"• {query}" for query in queries])
+        subqueries_msg = "🔍 Subqueries for company brief:\n" + queries_text
         messages = state.get('messages', [])
         messages.append(AIMessage(content=subqueries_msg))
         state['messages'] = messages
+        state.setdefault('subqueries_log', []).append(queries_text)
 
         # Send queries through WebSocket
         if websocket_manager := state.get('websocket_manager'):
@@ -103,4 +105,4 @@ class CompanyBriefNode(BaseResearcher):
              # Ensure key exists even on failure
              if 'company_brief_data' not in state:
                 state['company_brief_data'] = {}
-        return state # Always return the state
\ No newline at end of file
+        return {'company_brief_data': state.get('company_brief_data', {})} # Only our key; siblings run in the same step
\ No newline at end of file
@@ -55,10 +55,12 @@ class ContactFinderNode(BaseResearcher):
             )
 
             # Add generated queries to state messages for transparency
-            subqueries_msg = "🔍 Subqueries for contact finding:\n" + "\n".join([f"• {query}" for query in queries])
+            queries_text = "\n".join([f"• {query}" for query in queries])
+            subqueries_msg = "🔍 Subqueries for contact finding:\n" + queries_text
             messages = state.get('messages', [])
             messages.append(AIMessage(content=subqueries_msg))
             state['messages'] = messages
+            state.setdefault('subqueries_log', []).append(queries_text)
 
             # Send WebSocket update: Queries generated
             if websocket_manager and job_id:
@@ -159,4 +161,4 @@ class ContactFinderNode(BaseResearcher):
              # Ensure key exists even on failure
              if 'contact_finder_data' not in state:
                 state['contact_finder_data'] = {}
-        return state # Always return the state
\ No newline at end of file
+        return {'contact_finder_data': state.get('contact_finder_data', {})} # Only our key; siblings run in the same step
\ No newline at end of file
@@ -51,10 +51,12 @@ class FLWAnalyzer(BaseResearcher):
             )
 
             # Add generated queries to state messages for transparency
-            subqueries_msg = "🔍 Subqueries for FLW/Sustainability analysis:\n" + "\n".join([f"• {query}" for query in queries])
+            queries_text = "\n".join([f"• {query}" for query in queries])
+            subqueries_msg = "🔍 Subqueries for FLW/Sustainability analysis:\n" + queries_text
             messages = state.get('messages', [])
             messages.append(AIMessage(content=subqueries_msg))
             state['messages'] = messages
+            state.setdefault('subqueries_log', []).append(queries_text)
 
             # Send WebSocket update: Queries generated
             if websocket_manager and job_id:
@@ -155,4 +157,4 @@ class FLWAnalyzer(BaseResearcher):
              # Ensure key exists even on failure
              if 'flw_data' not in state:
                 state['flw_data'] = {}
-        return state # Always return the state
\ No newline at end of file
+        return {'flw_data': state.get('flw_data', {})} # Only our key; siblings run in the same step
\ No newline at end of file
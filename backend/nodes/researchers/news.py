@@ -34,10 +34,12 @@ class NewsSignalNode(BaseResearcher):
         - **Risk/Financial Health:** "layoffs", "stock price drop", "boycott", "regulatory issues". (e.g., '"{company}" layoffs 2024 2025', '"{company}" consumer boycott')
         """)
 
-        subqueries_msg = "🔍 Subqueries for news & signals:\n" + "\n".join([f"• {query}" for query in queries])
+        queries_text = "\n".join([f"• {query}" for query in queries])
+        subqueries_msg = "🔍 Subqueries for news & signals:\n" + queries_text
         messages = state.get('messages', [])
         messages.append(AIMessage(content=subqueries_msg))
         state['messages'] = messages
+        state.setdefault('subqueries_log', []).append(queries_text)
         
         news_signal_data = {}
         
@@ -98,4 +100,4 @@ class NewsSignalNode(BaseResearcher):
              # Ensure key exists even on failure
              if 'news_signal_data' not in state:
                 state['news_signal_data'] = {}
-        return state # Always return the state
\ No newline at end of file
+        return {'news_signal_data': state.get('news_signal_data', {})} # Only our key; siblings run in the same step
\ No newline at end of file
@@ -5,11 +5,12 @@ import re
 import asyncio
 from typing import Any, Dict, List, Tuple
 
-from openai import AsyncOpenAI
 from langchain_core.messages import AIMessage
 
 # Make sure ResearchState is imported correctly relative to this file's location
 from ..classes import ResearchState
+from ..utils.blocking import run_blocking
+from ..utils.http_clients import get_openai_client
 # Make sure the uploader function can be imported
 from backend.airtable_uploader import update_airtable_record # synchronous function
 
@@ -23,8 +24,8 @@ class Tagger:
         if not self.openai_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
 
-        # Configure OpenAI Client
-        self.openai_client = AsyncOpenAI(api_key=self.openai_key)
+        # Configure OpenAI Client (shared with the researchers)
+        self.openai_client = get_openai_client(self.openai_key)
 
         # Store the classification rules
         self.classification_rules = self._load_classification_rules()
@@ -274,10 +275,11 @@ Output only the selected category names, separated by commas.
         # Add results to messages list for logging/display
         if airtable_tags: 
             log_message = f"📊 Classification results for {company}:\n" + "\n".join([f"  • {field}: {', '.join(tags)}" for field, tags in airtable_tags.items()])
-            state.setdefault('messages', []).append(AIMessage(content=log_message))
         else:
             logger.info("No classification tags were successfully generated or validated.")
-            state.setdefault('messages', []).append(AIMessage(content=f"📊 No classification tags identified for {company}."))
+            log_message = f"📊 No classification tags identified for {company}."
+        state.setdefault('messages', []).append(AIMessage(content=log_message))
+        state.setdefault('process_notes', []).append(log_message) # Kept for Airtable "Process Notes"
 
         return state
 
@@ -318,7 +320,7 @@ Output only the selected category names, separated by commas.
             logger.warning("Airtable status update skipped: No record ID provided.")
             return
         try:
-            await asyncio.to_thread(update_airtable_record, record_id, {'Research Status': status_text})
+            await run_blocking(update_airtable_record, record_id, {'Research Status': status_text})
             logger.debug(f"Airtable status update successful for record {record_id}")
         except Exception as e:
             logger.error(f"{self.__class__.__name__} failed to update Airtable status for record {record_id}: {e}", exc_info=True)
\ No newline at end of file
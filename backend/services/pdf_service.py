@@ -1,4 +1,5 @@
 # backend/services/pdf_service.py
+import functools
 import io
 import logging
 import os
@@ -50,4 +51,16 @@ class PDFService:
 
         except Exception as e:
             logger.error(f"Failed to generate PDF stream: {e}", exc_info=True)
-            return (False, str(e))
\ No newline at end of file
+            return (False, str(e))
+
+@functools.lru_cache(maxsize=1)
+def _get_pdf_service() -> PDFService:
+    """One PDFService per (worker) process."""
+    return PDFService({"pdf_output_dir": "pdfs"})
+
+def generate_pdf_stream(markdown_content: str, company_name: str = "Company") -> Tuple[bool, Any]:
+    """
+    Module-level PDFService.generate_pdf_stream for process pools: only the
+    arguments are pickled per call, not a bound service instance.
+    """
+    return _get_pdf_service().generate_pdf_stream(markdown_content, company_name)
\ No newline at end of file
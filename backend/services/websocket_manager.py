@@ -1,10 +1,11 @@
 # backend/services/websocket_manager.py
 import asyncio
-import json
 import logging
 from collections import defaultdict
 from typing import Dict, List, Any
-from fastapi import WebSocket, WebSocketDisconnect
+
+import orjson
+from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
@@ -30,27 +31,29 @@ class WebSocketManager:
         except (ValueError, KeyError):
             logger.warning(f"WebSocket already disconnected or job_id {job_id} not found.")
 
+    def has_subscribers(self, job_id: str) -> bool:
+        """True if at least one WebSocket is connected for the job."""
+        return bool(self.active_connections.get(job_id))
+
     async def broadcast_to_job(self, job_id: str, update: Dict[str, Any]):
         """Send a JSON update to all WebSockets connected to a specific job."""
         if job_id not in self.active_connections:
             return
 
-        message = json.dumps(update)
-        disconnected_sockets = []
-
-        # Use asyncio.gather for concurrent sends
-        async def send_message(websocket: WebSocket):
-            try:
-                await websocket.send_text(message)
-            except (WebSocketDisconnect, RuntimeError):
-                disconnected_sockets.append(websocket)
+        # Serialize once and fan the same frame out to every subscriber.
+        # Sent as a text frame since clients JSON.parse the message data.
+        message = orjson.dumps(update, default=str).decode()
+        sockets = list(self.active_connections[job_id])
 
-        tasks = [send_message(ws) for ws in self.active_connections[job_id]]
-        await asyncio.gather(*tasks)
+        results = await asyncio.gather(
+            *(ws.send_text(message) for ws in sockets),
+            return_exceptions=True
+        )
 
-        # Clean up disconnected sockets
-        for websocket in disconnected_sockets:
-            self.disconnect(websocket, job_id)
+        # Drop any socket whose send failed rather than retrying it
+        for websocket, result in zip(sockets, results):
+            if isinstance(result, Exception):
+                self.disconnect(websocket, job_id)
 
     async def send_status_update(
         self,
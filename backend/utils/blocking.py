@@ -0,0 +1,15 @@
+# backend/utils/blocking.py
+import asyncio
+import functools
+
+
+async def run_blocking(func, /, *args, **kwargs):
+    """Runs a blocking call in the event loop's default executor.
+
+    Unlike asyncio.to_thread this skips copying the contextvars context,
+    which none of these calls need.
+    """
+    if kwargs:
+        func = functools.partial(func, *args, **kwargs)
+        args = ()
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
@@ -1,14 +1,15 @@
 # backend/utils/gdrive_uploader.py
 import os
 import io
-import json
+import orjson
 import logging
-import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
+from googleapiclient.http import MediaInMemoryUpload, MediaIoBaseUpload
+
+from .blocking import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,11 @@ SERVICE_ACCOUNT_FILE = "/secrets/gdrive_credentials.json"
 # Define the scopes required for Google Drive API
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
+# Payloads below this size go up in a single non-resumable request;
+# larger ones use a resumable upload with 8 MiB chunks.
+SINGLE_REQUEST_UPLOAD_LIMIT = 5_000_000
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+
 # --- HELPER: Get Google Drive Service ---
 def get_drive_service():
     """Authenticates and returns a Google Drive API service object."""
@@ -56,23 +62,24 @@ def _extract_folder_id_from_url(folder_url: str) -> Optional[str]:
 
 # --- CORE ASYNC UPLOAD FUNCTION ---
 async def upload_context_to_gdrive(
-    context: Dict[str, Any], 
+    context: Union[bytes, Dict[str, Any]], 
     folder_url: str, 
     file_name: str
 ):
     """
     Authenticates with Google Drive and uploads a JSON file of the
-    research context to the specified folder.
+    research context to the specified folder. `context` may be pre-serialized
+    JSON bytes or a dict (serialized here with orjson).
     
-    This function is designed to be called with asyncio.to_thread
-    as the Google API client library is synchronous.
+    The Google API client library is synchronous, so its blocking calls
+    run in the default executor via run_blocking.
     """
     
     folder_id = _extract_folder_id_from_url(folder_url)
     if not folder_id:
         raise ValueError(f"Invalid Google Drive folder URL provided: {folder_url}")
 
-    service = await asyncio.to_thread(get_drive_service)
+    service = await run_blocking(get_drive_service)
     if not service:
         raise ConnectionError("Failed to authenticate Google Drive service. Check credentials.")
 
@@ -80,8 +87,10 @@ async def upload_context_to_gdrive(
 
     # Convert the context dictionary to JSON bytes
     try:
-        json_content = json.dumps(context, indent=2)
-        media_buffer = io.BytesIO(json_content.encode('utf-8'))
+        if isinstance(context, bytes):
+            payload = context
+        else:
+            payload = orjson.dumps(context, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
     except Exception as e:
         logger.error(f"Failed to serialize context to JSON: {e}")
         raise
@@ -94,11 +103,15 @@ async def upload_context_to_gdrive(
     }
     
     # Create the media upload object
-    media = MediaIoBaseUpload(
-        media_buffer,
-        mimetype='application/json',
-        resumable=True
-    )
+    if len(payload) < SINGLE_REQUEST_UPLOAD_LIMIT:
+        media = MediaInMemoryUpload(payload, mimetype='application/json', resumable=False)
+    else:
+        media = MediaIoBaseUpload(
+            io.BytesIO(payload),
+            mimetype='application/json',
+            chunksize=RESUMABLE_CHUNK_SIZE,
+            resumable=True
+        )
 
     try:
         # --- Run the synchronous upload in a separate thread ---
@@ -131,12 +144,10 @@ async def upload_context_to_gdrive(
             return file.get('id')
         
         # Run the blocking I/O operation in a thread
-        file_id = await asyncio.to_thread(_execute_upload)
+        file_id = await run_blocking(_execute_upload)
         
         logger.info(f"Successfully uploaded/updated file. File ID: {file_id}")
 
     except Exception as e:
         logger.error(f"Failed to upload file '{file_name}' to Google Drive: {e}", exc_info=True)
-        raise
-    finally:
-        media_buffer.close()
\ No newline at end of file
+        raise
\ No newline at end of file
@@ -0,0 +1,36 @@
+# backend/utils/http_clients.py
+import logging
+from typing import Dict
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+logger = logging.getLogger(__name__)
+
+# One keep-alive pool for every OpenAI call in the process (5 researchers + tagger)
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+_openai_clients: Dict[str, AsyncOpenAI] = {}
+
+
+def get_openai_client(api_key: str) -> AsyncOpenAI:
+    """Returns the process-wide AsyncOpenAI client for this API key."""
+    client = _openai_clients.get(api_key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(limits=_HTTP_LIMITS),
+        )
+        _openai_clients[api_key] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Closes the shared clients; call on application shutdown."""
+    clients = list(_openai_clients.values())
+    _openai_clients.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.error(f"Error closing OpenAI client: {e}")
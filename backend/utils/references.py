@@ -1,3 +1,5 @@
+import functools
+import json
 import logging
 import re
 from typing import Any, Dict, List, Tuple
@@ -307,26 +309,46 @@ def extract_link_info(line: str) -> tuple[str, str]:
         logger.error(f"Error extracting link info from line: {line}, error: {str(e)}")
         return '', ''
 
+def _hashable(value: Any) -> Any:
+    """Returns value if it is hashable, else its sorted-key JSON so it can join a cache key."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+
 def format_references_section(references: List[str], reference_info: Dict[str, Dict[str, Any]], reference_titles: Dict[str, str]) -> str:
     """Format the references section for the final report."""
     if not references:
         return ""
-    
+
     logger.info(f"Formatting {len(references)} references for the report")
-    
+    # Only these fields feed the output, so they form the cache key
+    key = tuple(
+        (
+            _hashable(ref),
+            _hashable((info := reference_info.get(ref, {})).get('website', '')),
+            _hashable(info.get('title', '')),
+            _hashable(info.get('domain', '')),
+            _hashable(info.get('score', 0)),
+            _hashable(reference_titles.get(ref, '')),
+        )
+        for ref in references
+    )
+    reference_text = _format_references_cached(key)
+    logger.info(f"Completed references section with {len(key)} entries")
+    return reference_text
+
+
+@functools.lru_cache(maxsize=256)
+def _format_references_cached(key: Tuple[Tuple[Any, ...], ...]) -> str:
+    """Builds the references markdown; memoized on the fields it reads."""
     reference_entries = []
-    for ref in references:
-        info = reference_info.get(ref, {})
-        website = info.get('website', '')
-        title = info.get('title', '')
-        score = info.get('score', 0)
-        
+    for ref, website, title, domain, score, fallback_title in key:
         if not title or title.strip() == "":
-            title = reference_titles.get(ref, '')
+            title = fallback_title
             logger.debug(f"Using title from reference_titles for {ref}: '{title}'")
         
-        domain = info.get('domain', '')
-        
         if not title or title.strip() == "" or title == ref:
             title = ref
             logger.debug(f"No title found for {ref}, using URL as title")
@@ -353,7 +375,4 @@ def format_references_section(references: List[str], reference_info: Dict[str, D
         reference_lines.append(reference_line)
         logger.debug(f"Added reference: {reference_line}")
     
-    reference_text = "\n".join(reference_lines)
-    logger.info(f"Completed references section with {len(reference_entries)} entries")
-    
-    return reference_text
\ No newline at end of file
+    return "\n".join(reference_lines)
@@ -0,0 +1,25 @@
+# tests/test_state.py
+"""Guards that every Airtable column the uploader writes is fed from a declared ResearchState key."""
+from backend.airtable_uploader import _FIELD_SPEC
+from backend.classes.state import ResearchState
+from backend.graph import _AIRTABLE_FIELDS
+
+# report_data keys airtable_upload_node builds itself -> the state key each is derived from
+_DERIVED_REPORT_KEYS = {
+    "revenue_tags": "airtable_revenue_band_est",
+    "process_notes": "process_notes",
+    "references_formatted": "references",
+}
+
+STATE_KEYS = ResearchState.__required_keys__ | ResearchState.__optional_keys__
+
+
+def test_upload_fields_map_to_research_state():
+    state_keys = {sk for _, sk, _ in _AIRTABLE_FIELDS} | set(_DERIVED_REPORT_KEYS.values())
+    assert state_keys <= STATE_KEYS, f"Not declared on ResearchState: {sorted(state_keys - STATE_KEYS)}"
+
+
+def test_every_airtable_column_has_a_report_data_source():
+    produced = {rk for rk, _, _ in _AIRTABLE_FIELDS} | _DERIVED_REPORT_KEYS.keys()
+    column_keys = {key for _, key, _, _ in _FIELD_SPEC}
+    assert column_keys <= produced, f"No report_data source for: {sorted(column_keys - produced)}"